@@ -3,18 +3,62 @@ Bookmark Analyzer Module
 
 Analyzes bookmarks to identify patterns, extract metadata, and categorize them.
 """
+import functools
 import re
 import logging
+import time
 from collections import Counter, defaultdict
-from typing import Dict, List, Any, Set, Tuple, Optional
-from urllib.parse import urlparse, parse_qs
+from typing import Dict, List, Any, Tuple, Optional
+from urllib.parse import urlparse
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import DBSCAN
-import tqdm
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_url(url: str) -> Tuple[str, str, str]:
+    """
+    Split a URL into the parts used for categorization.
+
+    Args:
+        url: URL string
+
+    Returns:
+        Tuple of (lower-cased netloc, lower-cased path, TLD), with empty
+        strings for parts that can't be determined
+    """
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return '', '', ''
+
+    netloc = parsed.netloc.lower()
+
+    domain_parts = netloc.split('.')
+    tld = domain_parts[-1] if len(domain_parts) > 1 else ''
+
+    return netloc, parsed.path.lower(), tld
+
+
+@functools.lru_cache(maxsize=65536)
+def _extract_domain(url: str) -> str:
+    """
+    Extract domain from a URL.
+
+    Args:
+        url: URL string
+
+    Returns:
+        Domain string
+    """
+    domain = _parse_url(url)[0]
+
+    # Remove www. prefix if present
+    if domain.startswith('www.'):
+        domain = domain[4:]
+
+    return domain
 
 
 class BookmarkAnalyzer:
@@ -33,17 +77,6 @@ class BookmarkAnalyzer:
         self.logger = logging.getLogger(__name__)
         self.use_ml = use_ml
 
-        # Ensure NLTK data is downloaded
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            self.logger.info("Downloading NLTK data...")
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-
-        self.stop_words = set(stopwords.words('english'))
-
         # Common TLDs to recognize site categories
         self.tld_categories = {
             'edu': 'Education',
@@ -236,25 +269,47 @@ class BookmarkAnalyzer:
             'profile': 'Profiles',
         }
 
-        # Initialize category patterns for reuse
-        self._init_domain_patterns()
+        # Initialize category lookups for reuse
+        self._init_domain_lookup()
+        self._init_path_pattern()
+        self._init_title_pattern()
 
-    def _init_domain_patterns(self) -> None:
-        """Initialize regex patterns for domain matching."""
-        # Prepare domain patterns for efficient matching
-        self.domain_patterns = {}
+    def _init_domain_lookup(self) -> None:
+        """Split domain categories into an exact lookup and path-based entries."""
+        # Plain domains are matched with a single dict lookup
+        self._exact_domain_map = {}
+
+        # The few entries with a path component are checked only on a miss
+        self._path_domain_entries = []
 
         for domain, category in self.domain_categories.items():
-            # Handle domains with path components
             if '/' in domain:
                 base_domain, path = domain.split('/', 1)
-                pattern = re.compile(
-                    rf'^(?:www\.)?{re.escape(base_domain)}/.*{re.escape(path)}', re.IGNORECASE)
+                self._path_domain_entries.append(
+                    (base_domain.lower(), path.lower(), category))
             else:
-                pattern = re.compile(
-                    rf'^(?:www\.)?{re.escape(domain)}', re.IGNORECASE)
+                self._exact_domain_map.setdefault(domain.lower(), category)
+
+    def _init_path_pattern(self) -> None:
+        """Initialize a single regex matching any known path fragment."""
+        # Earlier fragments win when a path contains several
+        self._path_fragment_priority = {
+            fragment: priority for priority, fragment in enumerate(self.path_categories)}
+
+        # Alternatives are tried in priority order where fragments start at the same place
+        alternatives = '|'.join(re.escape(fragment) for fragment in self.path_categories)
+        self._path_pattern = re.compile(alternatives)
 
-            self.domain_patterns[pattern] = category
+    def _init_title_pattern(self) -> None:
+        """Initialize a single regex matching any title keyword as a whole word."""
+        # Earlier keywords win when a title contains several
+        self._title_keyword_priority = {
+            keyword: priority for priority, keyword in enumerate(self.title_keywords)}
+
+        # Keywords must match a whole token, i.e. not be part of a longer word
+        alternatives = '|'.join(re.escape(keyword) for keyword in self.title_keywords)
+        self._title_pattern = re.compile(
+            rf'(?<![A-Za-z0-9])(?:{alternatives})(?![A-Za-z0-9])')
 
     def categorize(self, bookmarks: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -270,21 +325,8 @@ class BookmarkAnalyzer:
         all_bookmarks = []
         self._extract_all_bookmarks(bookmarks, all_bookmarks)
 
-        # Apply individual categorization techniques
-        domain_categories = self._categorize_by_domain(all_bookmarks)
-        tld_categories = self._categorize_by_tld(all_bookmarks)
-        path_categories = self._categorize_by_path(all_bookmarks)
-        title_categories = self._categorize_by_title(all_bookmarks)
-        folder_categories = self._categorize_by_folder(bookmarks)
-
-        # Merge all category methods
-        merged_categories = self._merge_categories([
-            domain_categories,  # Highest priority
-            title_categories,
-            path_categories,
-            folder_categories,
-            tld_categories,     # Lowest priority
-        ])
+        # Apply all categorization techniques in priority order
+        merged_categories = self._categorize_all(all_bookmarks)
 
         # Apply ML-based clustering if enabled and sufficient data
         if self.use_ml and len(all_bookmarks) > 10:
@@ -300,207 +342,199 @@ class BookmarkAnalyzer:
 
     def _extract_all_bookmarks(self,
                                bookmark_data: Dict[str, Any],
-                               result: List[Dict[str, Any]],
-                               current_path: List[str] = None) -> None:
+                               result: List[Dict[str, Any]]) -> None:
         """
         Extract all bookmarks from nested structure into a flat list.
 
+        The tree is walked with an explicit stack in document order. Each
+        bookmark is added as a shallow copy carrying its folder path as a
+        tuple shared with its siblings.
+
         Args:
             bookmark_data: The bookmark data structure
             result: The list to append bookmarks to
-            current_path: The current folder path
         """
-        if current_path is None:
-            current_path = []
-
-        if bookmark_data['type'] == 'folder':
-            folder_path = current_path + [bookmark_data['title']]
-
-            for child in bookmark_data.get('children', []):
-                if child['type'] == 'bookmark':
-                    # Add folder path information to bookmark
-                    child_copy = child.copy()
-                    child_copy['folderPath'] = folder_path
-                    result.append(child_copy)
-                else:  # It's a folder
-                    self._extract_all_bookmarks(child, result, folder_path)
-
-    def _categorize_by_domain(self, bookmarks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        if bookmark_data['type'] != 'folder':
+            return
+
+        stack = [(bookmark_data, ())]
+
+        while stack:
+            node, path = stack.pop()
+
+            if node['type'] == 'folder':
+                folder_path = path + (node['title'],)
+
+                # Push in reverse so children come off the stack in document order
+                for child in reversed(node.get('children', [])):
+                    stack.append((child, folder_path))
+            else:  # It's a bookmark
+                # Add folder path information to bookmark
+                result.append({**node, 'folderPath': path})
+
+    def _categorize_all(self, bookmarks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Categorize bookmarks based on their domain.
+        Categorize bookmarks in a single pass, applying each technique in priority order.
+
+        Bookmarks are tracked by URL: when several bookmarks share a URL, only
+        the one matched by the highest priority technique is categorized.
 
         Args:
             bookmarks: List of bookmark dictionaries
 
         Returns:
-            Dictionary mapping domain-based categories to bookmark lists
+            Dictionary mapping category names to bookmark lists
         """
-        categories = defaultdict(list)
+        matches = map(self._match_category, bookmarks)
 
-        for bookmark in bookmarks:
-            url = bookmark.get('url', '')
-            if not url:
-                continue
-
-            domain = self._extract_domain(url)
+        # Best (priority, category, bookmark) seen so far for each URL
+        best = {}
 
-            # Check for exact domain matches
-            category = None
+        for bookmark, match in zip(bookmarks, matches):
+            if match is None:
+                continue
 
-            # Try to match domain with patterns
-            for pattern, cat in self.domain_patterns.items():
-                if pattern.match(domain):
-                    category = cat
-                    break
+            url = bookmark['url']
+            previous = best.get(url)
+            if previous is None or match[0] < previous[0]:
+                best[url] = (match[0], match[1], bookmark)
 
-            if category:
-                categories[category].append(bookmark)
+        categories = defaultdict(list)
+        for _, category, bookmark in best.values():
+            categories[category].append(bookmark)
 
         return categories
 
-    def _categorize_by_tld(self, bookmarks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def _match_category(self, bookmark: Dict[str, Any]) -> Optional[Tuple[int, str]]:
         """
-        Categorize bookmarks based on TLD.
+        Find the category for a single bookmark.
+
+        Techniques are tried in priority order: domain, title keywords,
+        URL path, existing folder, then TLD.
 
         Args:
-            bookmarks: List of bookmark dictionaries
+            bookmark: Bookmark dictionary
 
         Returns:
-            Dictionary mapping TLD-based categories to bookmark lists
+            Tuple of (priority, category), lower priorities winning,
+            or None if the bookmark has no URL or no technique matches
         """
-        categories = defaultdict(list)
+        url = bookmark.get('url', '')
+        if not url:
+            return None
 
-        for bookmark in bookmarks:
-            url = bookmark.get('url', '')
-            if not url:
-                continue
+        category = self._match_domain(url)
+        if category is not None:
+            return 0, category
 
-            # Parse URL and extract TLD
-            parsed_url = urlparse(url)
-            domain_parts = parsed_url.netloc.split('.')
+        category = self._match_title(bookmark.get('title', '').lower())
+        if category is not None:
+            return 1, category
 
-            if len(domain_parts) > 1:
-                tld = domain_parts[-1].lower()
+        category = self._match_path(url)
+        if category is not None:
+            return 2, category
 
-                # Check if this TLD has a predefined category
-                if tld in self.tld_categories:
-                    category = self.tld_categories[tld]
-                    categories[category].append(bookmark)
+        category = self._match_folder(bookmark)
+        if category is not None:
+            return 3, category
 
-        return categories
+        category = self.tld_categories.get(_parse_url(url)[2])
+        if category is not None:
+            return 4, category
 
-    def _categorize_by_path(self, bookmarks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        return None
+
+    def _match_domain(self, url: str) -> Optional[str]:
         """
-        Categorize bookmarks based on URL path components.
+        Find the category for a URL based on its domain.
 
         Args:
-            bookmarks: List of bookmark dictionaries
+            url: URL string
 
         Returns:
-            Dictionary mapping path-based categories to bookmark lists
+            Category name, or None if the domain isn't known
         """
-        categories = defaultdict(list)
+        # Ignore any port when looking up the host
+        domain = _extract_domain(url).partition(':')[0]
 
-        for bookmark in bookmarks:
-            url = bookmark.get('url', '')
-            if not url:
-                continue
+        # Check for exact domain matches
+        category = self._exact_domain_map.get(domain)
+        if category is not None:
+            return category
 
-            # Parse URL and extract path
-            parsed_url = urlparse(url)
-            path = parsed_url.path.lower()
+        # Fall back to domains that are only categorized for certain paths
+        path = None
+        for base_domain, path_fragment, category in self._path_domain_entries:
+            if domain != base_domain:
+                continue
 
-            # Check for matches with known path patterns
-            for path_pattern, category in self.path_categories.items():
-                if path_pattern in path:
-                    categories[category].append(bookmark)
-                    break
+            if path is None:
+                path = _parse_url(url)[1]
+            if path_fragment in path:
+                return category
 
-        return categories
+        return None
 
-    def _categorize_by_title(self, bookmarks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def _match_title(self, title: str) -> Optional[str]:
         """
-        Categorize bookmarks based on title keywords.
+        Find the category for a bookmark based on title keywords.
 
         Args:
-            bookmarks: List of bookmark dictionaries
+            title: Lower-cased bookmark title
 
         Returns:
-            Dictionary mapping title-based categories to bookmark lists
+            Category name, or None if no keyword matches
         """
-        categories = defaultdict(list)
-
-        for bookmark in bookmarks:
-            title = bookmark.get('title', '').lower()
-            if not title:
-                continue
+        if not title:
+            return None
 
-            # Tokenize the title
-            tokens = self._tokenize_and_clean(title)
+        # Find all keyword matches in one scan and keep the highest priority one
+        matches = self._title_pattern.findall(title)
+        if not matches:
+            return None
 
-            # Check for keyword matches
-            for keyword, category in self.title_keywords.items():
-                if keyword in tokens:
-                    categories[category].append(bookmark)
-                    break
+        keyword = min(matches, key=self._title_keyword_priority.__getitem__)
+        return self.title_keywords[keyword]
 
-        return categories
-
-    def _categorize_by_folder(self, bookmark_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    def _match_path(self, url: str) -> Optional[str]:
         """
-        Extract categories based on existing folder structure.
+        Find the category for a URL based on its path components.
 
         Args:
-            bookmark_data: The bookmark data structure
+            url: URL string
 
         Returns:
-            Dictionary mapping folder-based categories to bookmark lists
+            Category name, or None if no path pattern matches
         """
-        categories = defaultdict(list)
-
-        # Extract all bookmarks with their folder paths
-        all_bookmarks = []
-        self._extract_all_bookmarks(bookmark_data, all_bookmarks)
+        path = _parse_url(url)[1]
 
-        # Group by top-level folder
-        for bookmark in all_bookmarks:
-            folder_path = bookmark.get('folderPath', [])
-
-            # Skip root folder (usually just "Bookmarks")
-            if len(folder_path) > 1:
-                # Use the first meaningful folder name as category
-                category = folder_path[1]
-                categories[category].append(bookmark)
+        # Find all known fragments in one scan and keep the highest priority one
+        matches = self._path_pattern.findall(path)
+        if not matches:
+            return None
 
-        return categories
+        fragment = min(matches, key=self._path_fragment_priority.__getitem__)
+        return self.path_categories[fragment]
 
-    def _merge_categories(self, category_sets: List[Dict[str, List[Dict[str, Any]]]]) -> Dict[str, List[Dict[str, Any]]]:
+    def _match_folder(self, bookmark: Dict[str, Any]) -> Optional[str]:
         """
-        Merge multiple categorization results with prioritization.
+        Find the category for a bookmark based on its existing folder.
 
         Args:
-            category_sets: List of category dictionaries in priority order
+            bookmark: Bookmark dictionary with folder path information
 
         Returns:
-            Merged categories dictionary
+            Top-level folder name, or None for bookmarks in the root folder
         """
-        # Track which bookmarks have been categorized
-        categorized_bookmarks = set()
-        merged = defaultdict(list)
+        folder_path = bookmark.get('folderPath', [])
 
-        # Process each category set in priority order
-        for categories in category_sets:
-            for category, bookmarks in categories.items():
-                for bookmark in bookmarks:
-                    # Use the URL as a unique identifier
-                    bookmark_id = bookmark.get('url', '')
+        # Skip root folder (usually just "Bookmarks") and use the first
+        # meaningful folder name as category
+        if len(folder_path) > 1:
+            return folder_path[1]
 
-                    # Only add if not already categorized
-                    if bookmark_id and bookmark_id not in categorized_bookmarks:
-                        merged[category].append(bookmark)
-                        categorized_bookmarks.add(bookmark_id)
-
-        return merged
+        return None
 
     def _apply_ml_clustering(self,
                              bookmarks: List[Dict[str, Any]],
@@ -516,10 +550,9 @@ class BookmarkAnalyzer:
             Enhanced category dictionary
         """
         # Get uncategorized bookmarks
-        categorized_urls = set()
-        for category, items in existing_categories.items():
-            for item in items:
-                categorized_urls.add(item.get('url', ''))
+        categorized_urls = {item.get('url', '')
+                            for items in existing_categories.values()
+                            for item in items}
 
         uncategorized = [b for b in bookmarks if b.get(
             'url', '') not in categorized_urls]
@@ -533,7 +566,7 @@ class BookmarkAnalyzer:
         for bookmark in uncategorized:
             title = bookmark.get('title', '')
             url = bookmark.get('url', '')
-            domain = self._extract_domain(url)
+            domain = _extract_domain(url)
 
             # Combine title and domain for better clustering
             combined_text = f"{title} {domain}"
@@ -541,32 +574,50 @@ class BookmarkAnalyzer:
 
         # Vectorize text
         vectorizer = TfidfVectorizer(
-            max_features=100,
+            max_features=200,
             stop_words='english',
-            ngram_range=(1, 2),
-            min_df=2
+            # Bigrams of short titles rarely recur, so they only bloat the vocabulary
+            ngram_range=(1, 1),
+            min_df=2,
+            # Single precision halves the matrix and distance computation size
+            dtype=np.float32
         )
 
         try:
             # Transform texts to feature vectors
             X = vectorizer.fit_transform(texts)
 
-            # Apply DBSCAN clustering
+            # Apply DBSCAN clustering on the sparse matrix. Neighbourhoods are
+            # found in batches, so no dense N x N distance matrix is built.
             clustering = DBSCAN(eps=0.6, min_samples=2, metric='cosine')
-            labels = clustering.fit_predict(X.toarray())
-
-            # Add clusters to results
-            result = existing_categories.copy()
+            labels = clustering.fit_predict(X)
 
+            # Group cluster members once
+            clusters = defaultdict(list)
             for idx, label in enumerate(labels):
                 if label >= 0:  # Skip noise points (label -1)
-                    bookmark = uncategorized[idx]
-                    cluster_name = self._generate_cluster_name(
-                        [uncategorized[i]
-                            for i, l in enumerate(labels) if l == label],
-                        vectorizer
-                    )
-                    result[cluster_name].append(bookmark)
+                    clusters[label].append(idx)
+
+            # Add clusters to results, naming each cluster once
+            result = existing_categories.copy()
+            feature_names = vectorizer.get_feature_names_out()
+
+            generated_names = set()
+
+            for indices in clusters.values():
+                cluster_bookmarks = [uncategorized[i] for i in indices]
+                base_name = self._generate_cluster_name(
+                    cluster_bookmarks, X[indices], feature_names)
+
+                # Keep separate clusters apart when they get the same name
+                cluster_name = base_name
+                suffix = 2
+                while cluster_name in generated_names:
+                    cluster_name = f"{base_name} {suffix}"
+                    suffix += 1
+                generated_names.add(cluster_name)
+
+                result[cluster_name].extend(cluster_bookmarks)
 
             return result
 
@@ -576,49 +627,49 @@ class BookmarkAnalyzer:
 
     def _generate_cluster_name(self,
                                cluster_bookmarks: List[Dict[str, Any]],
-                               vectorizer: TfidfVectorizer) -> str:
+                               cluster_matrix: Any,
+                               feature_names: Any) -> str:
         """
         Generate a meaningful name for a cluster.
 
         Args:
             cluster_bookmarks: Bookmarks in the cluster
-            vectorizer: TF-IDF vectorizer used
+            cluster_matrix: TF-IDF rows of the bookmarks in the cluster
+            feature_names: Vocabulary of the fitted TF-IDF vectorizer
 
         Returns:
             Cluster name
         """
-        # Extract common words from titles
-        title_words = []
-        domains = []
-
-        for bookmark in cluster_bookmarks:
-            title = bookmark.get('title', '')
-            url = bookmark.get('url', '')
-            domain = self._extract_domain(url)
+        # Average weight of each term across the cluster, and the number of
+        # bookmarks each term appears in
+        centroid = np.asarray(cluster_matrix.mean(axis=0)).ravel()
+        term_counts = cluster_matrix.getnnz(axis=0)
 
-            # Add title words
-            title_words.extend(self._tokenize_and_clean(title))
+        domains = [domain for domain in
+                   (_extract_domain(bookmark.get('url', '')) for bookmark in cluster_bookmarks)
+                   if domain]
 
-            # Add domain
-            if domain:
-                domains.append(domain)
+        # Domain labels are part of the clustered text but make poor names
+        excluded = {label for domain in domains for label in domain.split('.')}
 
-        # Count word frequencies
-        word_counter = Counter(title_words)
-        domain_counter = Counter(domains)
+        # Take the highest weighted terms shared by several bookmarks,
+        # skipping short words and domain labels
+        words = []
+        for index in centroid.argsort()[::-1]:
+            if centroid[index] <= 0 or len(words) == 3:
+                break
 
-        # Get most common words and domain
-        common_words = [word for word, count in word_counter.most_common(3)
-                        if count > 1 and len(word) > 3]
-        common_domain = domain_counter.most_common(
-            1)[0][0] if domain_counter else ""
+            word = feature_names[index]
+            if term_counts[index] > 1 and len(word) > 3 and word not in excluded:
+                words.append(word)
 
         # If we have common words, use them for the name
-        if common_words:
-            return " ".join(common_words).title()
+        if words:
+            return " ".join(words).title()
 
         # Otherwise, use the most common domain
-        if common_domain:
+        if domains:
+            common_domain = Counter(domains).most_common(1)[0][0]
             return f"{common_domain.split('.')[0].title()} Resources"
 
         # Fallback name
@@ -637,67 +688,15 @@ class BookmarkAnalyzer:
         Returns:
             Filtered and sorted categories
         """
-        # Filter out categories with too few items
-        filtered = {cat: items for cat, items in categories.items()
-                    if len(items) >= min_items}
+        # Filter out categories with too few items, measuring each list once
+        sized = [(len(items), cat, items) for cat, items in categories.items()
+                 if len(items) >= min_items]
 
-        # Sort categories by number of items (descending)
-        sorted_cats = dict(sorted(
-            filtered.items(),
-            key=lambda x: (len(x[1]), x[0]),
-            reverse=True
-        ))
+        # Sort categories by number of items (descending), then by name;
+        # names are unique so the item lists are never compared
+        sized.sort(reverse=True)
 
-        return sorted_cats
-
-    def _extract_domain(self, url: str) -> str:
-        """
-        Extract domain from a URL.
-
-        Args:
-            url: URL string
-
-        Returns:
-            Domain string
-        """
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-
-            # Remove www. prefix if present
-            if domain.startswith('www.'):
-                domain = domain[4:]
-
-            return domain
-        except:
-            return ""
-
-    def _tokenize_and_clean(self, text: str) -> List[str]:
-        """
-        Tokenize text and remove stopwords.
-
-        Args:
-            text: Input text
-
-        Returns:
-            List of cleaned tokens
-        """
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove special characters
-        text = re.sub(r'[^\w\s]', ' ', text)
-
-        # Tokenize
-        tokens = word_tokenize(text)
-
-        # Remove stopwords and short words
-        cleaned = [
-            word for word in tokens
-            if word not in self.stop_words and len(word) > 2
-        ]
-
-        return cleaned
+        return {cat: items for _, cat, items in sized}
 
     def extract_metadata(self, bookmarks: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -713,20 +712,13 @@ class BookmarkAnalyzer:
         self._extract_all_bookmarks(bookmarks, all_bookmarks)
 
         # Calculate domain statistics
-        domains = {}
-        for bookmark in all_bookmarks:
-            url = bookmark.get('url', '')
-            domain = self._extract_domain(url)
-
-            if domain:
-                if domain in domains:
-                    domains[domain] += 1
-                else:
-                    domains[domain] = 1
+        domains = Counter(
+            domain for domain in (_extract_domain(bookmark.get('url', ''))
+                                  for bookmark in all_bookmarks)
+            if domain)
 
-        # Sort domains by frequency
-        top_domains = sorted(
-            domains.items(), key=lambda x: x[1], reverse=True)[:20]
+        # Keep the most frequent domains
+        top_domains = domains.most_common(20)
 
         # Count bookmarks by date
         date_counts = defaultdict(int)
@@ -757,13 +749,10 @@ class BookmarkAnalyzer:
         Returns:
             Year-month string (YYYY-MM)
         """
-        import datetime
-
-        # Convert from milliseconds to seconds
-        seconds = timestamp / 1000
-        date = datetime.datetime.fromtimestamp(seconds)
+        # Convert from milliseconds to seconds (local time, as before)
+        date = time.localtime(timestamp / 1000)
 
-        return date.strftime('%Y-%m')
+        return f"{date.tm_year:04d}-{date.tm_mon:02d}"
 
     def _calculate_avg_path_depth(self, bookmarks: List[Dict[str, Any]]) -> float:
         """
@@ -3,11 +3,140 @@ Bookmark Exporter Module
 
 Exports organized bookmarks to various formats.
 """
+import functools
+import io
 import json
 import logging
 import os
+import re
+import sys
 from datetime import datetime
-from typing import Dict, List, Any, Optional, TextIO
+from typing import Dict, Iterator, Any, Optional, TextIO, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Single-pass replacement table for HTML special characters
+_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+_ESCAPE_RE = re.compile(r'[&<>"\']')
+
+# Shared preamble of the Netscape bookmark file format
+_NETSCAPE_PREAMBLE = (
+    '<!DOCTYPE NETSCAPE-Bookmark-file-1>\n'
+    '<!-- This is an automatically generated file.\n'
+    '     It will be read and overwritten.\n'
+    '     DO NOT EDIT! -->\n'
+    '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+)
+
+_GENERIC_HEADER = (
+    '<!DOCTYPE NETSCAPE-Bookmark-file-1>\n'
+    '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+    '<TITLE>Bookmarks</TITLE>\n'
+    '<H1>Bookmarks</H1>\n'
+    '<DL><p>\n'
+)
+
+# Document headers keyed by browser compatibility mode
+_HTML_HEADERS = {
+    'chrome': _NETSCAPE_PREAMBLE + (
+        '<TITLE>Bookmarks</TITLE>\n'
+        '<H1>Bookmarks</H1>\n'
+        '<DL><p>\n'
+    ),
+    'firefox': _NETSCAPE_PREAMBLE + (
+        '<TITLE>Bookmarks</TITLE>\n'
+        '<H1>Bookmarks Menu</H1>\n'
+        '<DL><p>\n'
+    ),
+    'safari': (
+        '<!DOCTYPE html>\n'
+        '<html>\n'
+        '<head>\n'
+        '    <meta charset="UTF-8">\n'
+        '    <title>Bookmarks</title>\n'
+        '</head>\n'
+        '<body>\n'
+        '<h1>Bookmarks</h1>\n'
+        '<dl><p>\n'
+    ),
+}
+_HTML_HEADERS['edge'] = _HTML_HEADERS['chrome']
+
+_GENERIC_FOOTER = '</DL><p>\n'
+
+# Document footers keyed by browser compatibility mode, matching the headers
+_HTML_FOOTERS = {
+    'safari': (
+        '</dl><p>\n'
+        '</body>\n'
+        '</html>\n'
+    ),
+}
+
+# Write buffer for exports that are written out in many small pieces
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Indentation strings for the common nesting depths
+_INDENTS = tuple('    ' * i for i in range(64))
+
+
+@functools.lru_cache(maxsize=8192)
+def _escape_html(text: str) -> str:
+    """
+    Escape HTML special characters.
+
+    Args:
+        text: Text to escape
+
+    Returns:
+        Escaped text
+    """
+    # Most titles have nothing to escape; return them without copying
+    if _ESCAPE_RE.search(text) is None:
+        return text
+    return text.translate(_ESCAPE_TABLE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: int) -> str:
+    """
+    Format a timestamp as a readable date string.
+
+    Args:
+        timestamp: Timestamp in milliseconds
+
+    Returns:
+        Formatted date string
+    """
+    if not timestamp:
+        return ""
+
+    try:
+        dt = datetime.fromtimestamp(timestamp / 1000)
+        return dt.strftime('%Y-%m-%d %H:%M:%S')
+    except (OSError, OverflowError, TypeError, ValueError):
+        return ""
+
+
+def _ensure_parent_dir(path: str) -> None:
+    """
+    Create the directory containing a file if it doesn't exist yet.
+
+    Args:
+        path: Path of the file about to be written
+    """
+    parent = os.path.dirname(path)
+    if parent and not os.path.isdir(parent):
+        os.makedirs(parent, exist_ok=True)
 
 
 class BookmarkExporter:
@@ -30,167 +159,156 @@ class BookmarkExporter:
             browser_compat: Which browser to optimize compatibility for
                 (chrome, firefox, edge, or safari)
         """
+        self.export_html_with_counts(bookmarks, output_path, browser_compat)
+
+    def export_html_with_counts(self,
+                                bookmarks: Dict[str, Any],
+                                output_path: str,
+                                browser_compat: str = "chrome") -> Dict[str, int]:
+        """
+        Export bookmarks to an HTML file and count them in the same pass.
+
+        Saves a separate walk over the tree when the caller also needs the
+        totals that BookmarkParser.count_bookmarks_and_folders would report.
+
+        Args:
+            bookmarks: Bookmark data structure
+            output_path: Path to save the HTML file
+            browser_compat: Which browser to optimize compatibility for
+                (chrome, firefox, edge, or safari)
+
+        Returns:
+            Dictionary with bookmark and folder counts, not counting the root folder
+        """
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(
-            os.path.abspath(output_path)), exist_ok=True)
+        _ensure_parent_dir(output_path)
+
+        # Build the whole document in memory and write it out in one go
+        buf = io.StringIO()
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Write HTML header based on browser compatibility
-            self._write_html_header(f, browser_compat)
+        # Write HTML header based on browser compatibility
+        self._write_html_header(buf, browser_compat)
 
-            # Write bookmark data
-            self._write_bookmark_html(f, bookmarks)
+        # Write bookmark data
+        counts = self._write_bookmark_html(buf, bookmarks)
 
-            # Write HTML footer
-            self._write_html_footer(f)
+        # Write HTML footer
+        self._write_html_footer(buf, browser_compat)
 
-    def _write_html_header(self, f: TextIO, browser_compat: str) -> None:
+        # Encode the finished document in one call and skip the text layer
+        with open(output_path, 'wb') as f:
+            f.write(buf.getvalue().encode('utf-8'))
+
+        return counts
+
+    def _write_html_header(self, buf: TextIO, browser_compat: str) -> None:
         """
         Write the HTML header for the bookmarks file.
 
         Args:
-            f: File object to write to
+            buf: Buffer to write to
             browser_compat: Browser compatibility mode
         """
-        # Current timestamp
-        timestamp = int(datetime.now().timestamp())
-
-        if browser_compat.lower() in ("chrome", "edge"):
-            f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n')
-            f.write('<!-- This is an automatically generated file.\n')
-            f.write('     It will be read and overwritten.\n')
-            f.write('     DO NOT EDIT! -->\n')
-            f.write(
-                '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n')
-            f.write(f'<TITLE>Bookmarks</TITLE>\n')
-            f.write(f'<H1>Bookmarks</H1>\n')
-            f.write(f'<DL><p>\n')
-
-        elif browser_compat.lower() == "firefox":
-            f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n')
-            f.write('<!-- This is an automatically generated file.\n')
-            f.write('     It will be read and overwritten.\n')
-            f.write('     DO NOT EDIT! -->\n')
-            f.write(
-                '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n')
-            f.write(f'<TITLE>Bookmarks</TITLE>\n')
-            f.write(f'<H1>Bookmarks Menu</H1>\n')
-            f.write(f'<DL><p>\n')
-
-        elif browser_compat.lower() == "safari":
-            f.write('<!DOCTYPE html>\n')
-            f.write('<html>\n')
-            f.write('<head>\n')
-            f.write('    <meta charset="UTF-8">\n')
-            f.write('    <title>Bookmarks</title>\n')
-            f.write('</head>\n')
-            f.write('<body>\n')
-            f.write(f'<h1>Bookmarks</h1>\n')
-            f.write(f'<dl><p>\n')
-
-        else:  # Generic format, compatible with most browsers
-            f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n')
-            f.write(
-                '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n')
-            f.write(f'<TITLE>Bookmarks</TITLE>\n')
-            f.write(f'<H1>Bookmarks</H1>\n')
-            f.write(f'<DL><p>\n')
-
-    def _write_html_footer(self, f: TextIO) -> None:
+        # Generic format, compatible with most browsers, for anything else
+        buf.write(_HTML_HEADERS.get(browser_compat.lower(), _GENERIC_HEADER))
+
+    def _write_html_footer(self, buf: TextIO, browser_compat: str) -> None:
         """
         Write the HTML footer for the bookmarks file.
 
         Args:
-            f: File object to write to
+            buf: Buffer to write to
+            browser_compat: Browser compatibility mode
         """
-        f.write('</DL><p>\n')
+        buf.write(_HTML_FOOTERS.get(browser_compat.lower(), _GENERIC_FOOTER))
 
-    def _write_bookmark_html(self, f: TextIO, bookmark_data: Dict[str, Any], indent: int = 1) -> None:
+    def _write_bookmark_html(self, buf: TextIO, bookmark_data: Dict[str, Any],
+                             indent: int = 1) -> Dict[str, int]:
         """
         Write bookmark data as HTML.
 
+        The tree is walked with an explicit stack. A folder pushes a closing
+        marker below its children so its </DL> is written once they are done.
+
         Args:
-            f: File object to write to
+            buf: Buffer to write to
             bookmark_data: Bookmark data to write
-            indent: Current indentation level
-        """
-        # Skip the root folder's title, just process its children
-        if indent == 1 and bookmark_data['type'] == 'folder':
-            for child in bookmark_data.get('children', []):
-                self._write_bookmark_html(f, child, indent)
-            return
+            indent: Indentation level of the top-level entries
 
-        # Generate indentation
-        indent_str = '    ' * indent
+        Returns:
+            Dictionary with the number of bookmarks and folders written
+        """
+        counts = {"bookmarks": 0, "folders": 0}
 
+        # Skip the root folder's title, just process its children
         if bookmark_data['type'] == 'folder':
-            # Write folder header
-            date_added = bookmark_data.get(
-                'dateAdded', 0) // 1000  # Convert to seconds
-            last_modified = bookmark_data.get(
-                'lastModified', date_added) // 1000
-
-            f.write(
-                f'{indent_str}<DT><H3 ADD_DATE="{date_added}" LAST_MODIFIED="{last_modified}">')
-            f.write(self._escape_html(bookmark_data['title']))
-            f.write('</H3>\n')
-
-            # Write folder contents
-            f.write(f'{indent_str}<DL><p>\n')
-
-            # Write all children
-            for child in bookmark_data.get('children', []):
-                self._write_bookmark_html(f, child, indent + 1)
-
-            # Close folder
-            f.write(f'{indent_str}</DL><p>\n')
-
-        else:  # Bookmark
-            # Write bookmark
-            url = bookmark_data.get('url', '')
-            title = bookmark_data.get('title', url)
-            date_added = bookmark_data.get('dateAdded', 0) // 1000
-            last_modified = bookmark_data.get(
-                'lastModified', date_added) // 1000
-            icon = bookmark_data.get('icon', '')
-
-            f.write(f'{indent_str}<DT><A HREF="{url}" ADD_DATE="{date_added}"')
-
-            # Add icon if available
-            if icon:
-                f.write(f' ICON="{icon}"')
-
-            # Add last modified if available and different from date added
-            if last_modified and last_modified != date_added:
-                f.write(f' LAST_MODIFIED="{last_modified}"')
-
-            # Add tags if available
-            tags = bookmark_data.get('tags', [])
-            if tags:
-                tags_str = ','.join(tags)
-                f.write(f' TAGS="{tags_str}"')
-
-            f.write('>')
-            f.write(self._escape_html(title))
-            f.write('</A>\n')
-
-    def _escape_html(self, text: str) -> str:
-        """
-        Escape HTML special characters.
+            stack = [(child, indent)
+                     for child in reversed(bookmark_data.get('children', []))]
+        else:
+            stack = [(bookmark_data, indent)]
+
+        while stack:
+            node, level = stack.pop()
+
+            # Generate indentation
+            indent_str = (_INDENTS[level] if level < len(_INDENTS)
+                          else '    ' * level)
+
+            if node is None:
+                # Close folder
+                buf.write(f'{indent_str}</DL><p>\n')
+
+            elif node['type'] == 'folder':
+                counts["folders"] += 1
+
+                # Write folder header
+                date_added = node.get(
+                    'dateAdded', 0) // 1000  # Convert to seconds
+                last_modified = node.get(
+                    'lastModified', date_added) // 1000
+
+                # Folder names repeat a lot; interned keys make escape cache hits cheap
+                title = _escape_html(sys.intern(node['title']))
+                buf.write(
+                    f'{indent_str}<DT><H3 ADD_DATE="{date_added}" LAST_MODIFIED="{last_modified}">'
+                    f'{title}</H3>\n{indent_str}<DL><p>\n')
+
+                # Close the folder after all of its children, which are
+                # pushed in reverse so they come off the stack in order
+                stack.append((None, level))
+                for child in reversed(node.get('children', [])):
+                    stack.append((child, level + 1))
+
+            else:  # Bookmark
+                counts["bookmarks"] += 1
+
+                # Write bookmark
+                url = node.get('url', '')
+                title = node.get('title', url)
+                date_added = node.get('dateAdded', 0) // 1000
+                last_modified = node.get(
+                    'lastModified', date_added) // 1000
+                icon = node.get('icon', '')
+
+                attrs = [f'HREF="{url}"', f'ADD_DATE="{date_added}"']
+
+                # Add icon if available
+                if icon:
+                    attrs.append(f'ICON="{icon}"')
+
+                # Add last modified if available and different from date added
+                if last_modified and last_modified != date_added:
+                    attrs.append(f'LAST_MODIFIED="{last_modified}"')
 
-        Args:
-            text: Text to escape
+                # Add tags if available
+                tags = node.get('tags', [])
+                if tags:
+                    attrs.append(f'TAGS="{",".join(tags)}"')
 
-        Returns:
-            Escaped text
-        """
-        return (text
-                .replace('&', '&amp;')
-                .replace('<', '&lt;')
-                .replace('>', '&gt;')
-                .replace('"', '&quot;')
-                .replace("'", '&#39;')
-                )
+                buf.write(
+                    f'{indent_str}<DT><A {" ".join(attrs)}>{_escape_html(title)}</A>\n')
+
+        return counts
 
     def export_json(self, bookmarks: Dict[str, Any], output_path: str) -> None:
         """
@@ -201,10 +319,17 @@ class BookmarkExporter:
             output_path: Path to save the JSON file
         """
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(
-            os.path.abspath(output_path)), exist_ok=True)
+        _ensure_parent_dir(output_path)
+
+        if orjson is not None:
+            data = orjson.dumps(
+                bookmarks, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            return
 
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with open(output_path, 'w', encoding='utf-8',
+                  buffering=_WRITE_BUFFER_SIZE) as f:
             json.dump(bookmarks, f, indent=2, ensure_ascii=False)
 
     def export_csv(self,
@@ -222,91 +347,77 @@ class BookmarkExporter:
         import csv
 
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(
-            os.path.abspath(output_path)), exist_ok=True)
+        _ensure_parent_dir(output_path)
 
-        # Extract all bookmarks
-        all_bookmarks = []
-        self._extract_all_bookmarks(bookmarks, all_bookmarks)
+        with open(output_path, 'w', encoding='utf-8', newline='',
+                  buffering=_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
 
-        with open(output_path, 'w', encoding='utf-8', newline='') as f:
-            # Define fields
+            # Write header
             if include_folders:
-                fieldnames = ['title', 'url', 'folder_path',
-                              'date_added', 'last_modified', 'tags']
+                writer.writerow(['title', 'url', 'folder_path',
+                                 'date_added', 'last_modified', 'tags'])
             else:
-                fieldnames = ['title', 'url',
-                              'date_added', 'last_modified', 'tags']
-
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+                writer.writerow(['title', 'url',
+                                 'date_added', 'last_modified', 'tags'])
 
-            for bookmark in all_bookmarks:
+            for bookmark, folder_path in self._extract_all_bookmarks(bookmarks):
                 # Skip non-bookmark items
                 if bookmark.get('type') != 'bookmark':
                     continue
 
-                row = {
-                    'title': bookmark.get('title', ''),
-                    'url': bookmark.get('url', ''),
-                    'date_added': self._format_timestamp(bookmark.get('dateAdded', 0)),
-                    'last_modified': self._format_timestamp(bookmark.get('lastModified', 0))
-                }
-
-                # Add folder path if requested
-                if include_folders:
-                    folder_path = bookmark.get('folderPath', [])
-                    row['folder_path'] = '/'.join(folder_path[1:]
-                                                  ) if len(folder_path) > 1 else ''
+                title = bookmark.get('title', '')
+                url = bookmark.get('url', '')
+                date_added = _format_timestamp(bookmark.get('dateAdded', 0))
+                last_modified = _format_timestamp(
+                    bookmark.get('lastModified', 0))
 
                 # Add tags if available
-                tags = bookmark.get('tags', [])
-                row['tags'] = ','.join(tags) if tags else ''
+                tags_str = ','.join(bookmark.get('tags') or ())
 
-                writer.writerow(row)
+                # Add folder path if requested
+                if include_folders:
+                    writer.writerow([title, url, folder_path,
+                                     date_added, last_modified, tags_str])
+                else:
+                    writer.writerow([title, url,
+                                     date_added, last_modified, tags_str])
 
-    def _format_timestamp(self, timestamp: int) -> str:
+    def _extract_all_bookmarks(self,
+                               bookmark_data: Dict[str, Any]
+                               ) -> Iterator[Tuple[Dict[str, Any], str]]:
         """
-        Format a timestamp as a readable date string.
+        Iterate over all bookmarks in a nested structure.
+
+        Bookmarks are not copied; each one is paired with its folder path
+        below the root, joined with '/'. The path string is built once per
+        folder and shared by its bookmarks. The tree is walked with an
+        explicit stack in document order.
 
         Args:
-            timestamp: Timestamp in milliseconds
+            bookmark_data: The bookmark data structure
 
-        Returns:
-            Formatted date string
+        Yields:
+            (bookmark, folder path) pairs
         """
-        if not timestamp:
-            return ""
+        if bookmark_data['type'] != 'folder':
+            return
 
-        try:
-            dt = datetime.fromtimestamp(timestamp / 1000)
-            return dt.strftime('%Y-%m-%d %H:%M:%S')
-        except:
-            return ""
+        stack = [(bookmark_data, None, '')]
 
-    def _extract_all_bookmarks(self,
-                               bookmark_data: Dict[str, Any],
-                               result: List[Dict[str, Any]],
-                               current_path: List[str] = None) -> None:
-        """
-        Extract all bookmarks from nested structure into a flat list.
+        while stack:
+            node, path, path_str = stack.pop()
 
-        Args:
-            bookmark_data: The bookmark data structure
-            result: The list to append bookmarks to
-            current_path: The current folder path
-        """
-        if current_path is None:
-            current_path = []
+            if node['type'] == 'folder':
+                # The root folder's title is left out of the path
+                if path is None:
+                    folder_path = ()
+                else:
+                    folder_path = path + (node['title'],)
+                folder_path_str = '/'.join(folder_path)
 
-        if bookmark_data['type'] == 'folder':
-            folder_path = current_path + [bookmark_data['title']]
-
-            for child in bookmark_data.get('children', []):
-                if child['type'] == 'bookmark':
-                    # Add folder path information to bookmark
-                    child_copy = child.copy()
-                    child_copy['folderPath'] = folder_path
-                    result.append(child_copy)
-                else:  # It's a folder
-                    self._extract_all_bookmarks(child, result, folder_path)
+                # Push in reverse so children come off the stack in document order
+                for child in reversed(node.get('children', [])):
+                    stack.append((child, folder_path, folder_path_str))
+            else:  # It's a bookmark
+                yield node, path_str
@@ -12,7 +12,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from bookmark_organizer.parser import BookmarkParser
 from bookmark_organizer.analyzer import BookmarkAnalyzer
 from bookmark_organizer.organizer import BookmarkOrganizer
-from bookmark_organizer.validator import BookmarkValidator
+from bookmark_organizer.validator import BookmarkValidator, DEFAULT_CACHE_PATH
 from bookmark_organizer.exporter import BookmarkExporter
 
 # Create Typer app
@@ -70,6 +70,8 @@ def validate_bookmarks(
         True, "--find-duplicates/--no-duplicates", help="Find duplicate bookmarks"),
     output_path: Optional[str] = typer.Option(
         None, "--output", "-o", help="Path to save validation report"),
+    use_cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Cache link check results between runs"),
 ):
     """Validate bookmarks and check for issues."""
     console.print(f"[bold blue]Validating bookmarks from:[/] {file_path}")
@@ -79,29 +81,37 @@ def validate_bookmarks(
         parser = BookmarkParser()
         bookmarks = parser.parse_file(file_path)
 
-        # Create validator
-        validator = BookmarkValidator()
-
-        with Progress(
+        with BookmarkValidator(
+            cache_path=DEFAULT_CACHE_PATH if use_cache else None
+        ) as validator, Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]{task.description}"),
             console=console,
         ) as progress:
+            # Walk the tree once and share the result between both checks
+            entries = list(validator.iter_bookmarks(bookmarks))
+
+            # Declare every enabled stage up front
+            if check_links:
+                check_task = progress.add_task(
+                    "Checking for broken links...", total=1)
+            if find_duplicates:
+                duplicates_task = progress.add_task(
+                    "Finding duplicate bookmarks...", total=1)
+
             # Check for broken links
             broken_links = []
             if check_links:
-                task = progress.add_task(
-                    "Checking for broken links...", total=1)
-                broken_links = validator.find_broken_links(bookmarks)
-                progress.update(task, advance=1)
+                broken_links = validator.find_broken_links(
+                    bookmarks, entries=entries)
+                progress.update(check_task, completed=1)
 
             # Find duplicates
             duplicates = []
             if find_duplicates:
-                task = progress.add_task(
-                    "Finding duplicate bookmarks...", total=1)
-                duplicates = validator.find_duplicates(bookmarks)
-                progress.update(task, advance=1)
+                duplicates = validator.find_duplicates(
+                    bookmarks, entries=entries)
+                progress.update(duplicates_task, completed=1)
 
         # Display results
         console.print(f"\n[bold]Validation Results:[/]")
@@ -152,6 +162,8 @@ def organize_bookmarks(
         False, "--merge-duplicates", help="Merge duplicate bookmarks"),
     export_format: str = typer.Option(
         "html", "--format", "-f", help="Export format (html or json)"),
+    use_cache: bool = typer.Option(
+        False, "--cache/--no-cache", help="Cache link check results between runs"),
 ):
     """Organize bookmarks into a better structure."""
     console.print(f"[bold blue]Organizing bookmarks from:[/] {file_path}")
@@ -164,72 +176,88 @@ def organize_bookmarks(
         # Set up components
         analyzer = BookmarkAnalyzer()
         organizer = BookmarkOrganizer()
-        validator = BookmarkValidator()
         exporter = BookmarkExporter()
 
-        with Progress(
+        with BookmarkValidator(
+            cache_path=DEFAULT_CACHE_PATH if use_cache else None
+        ) as validator, Progress(
             SpinnerColumn(),
             TextColumn("[bold blue]{task.description}"),
             console=console,
         ) as progress:
-            # Handle broken links
+            # Declare every enabled stage up front
             if remove_broken:
-                task = progress.add_task(
+                check_task = progress.add_task(
                     "Checking for broken links...", total=1)
-                broken_links = validator.find_broken_links(bookmarks)
-                progress.update(task, advance=1)
+                remove_task = progress.add_task(
+                    "Removing broken links...", total=1)
+            if merge_duplicates:
+                duplicates_task = progress.add_task(
+                    "Finding duplicate bookmarks...", total=1)
+                merge_task = progress.add_task(
+                    "Merging duplicate bookmarks...", total=1)
+            categorize_task = progress.add_task(
+                "Analyzing and categorizing bookmarks...", total=1)
+            organize_task = progress.add_task(
+                "Creating optimized folder structure...", total=1)
+            export_task = progress.add_task(
+                f"Exporting to {export_format}...", total=1)
+
+            # Walk the tree once and share the result between both checks
+            if remove_broken or merge_duplicates:
+                entries = list(validator.iter_bookmarks(bookmarks))
+
+            # Handle broken links
+            if remove_broken:
+                broken_links = validator.find_broken_links(
+                    bookmarks, entries=entries)
+                progress.update(check_task, completed=1)
 
                 if broken_links:
-                    task = progress.add_task(
-                        "Removing broken links...", total=1)
                     bookmarks = organizer.remove_broken_links(
                         bookmarks, broken_links)
-                    progress.update(task, advance=1)
+                    # The tree was rebuilt, so the shared walk is stale
+                    if merge_duplicates:
+                        entries = list(validator.iter_bookmarks(bookmarks))
                     console.print(f"Removed {len(broken_links)} broken links")
+                progress.update(remove_task, completed=1)
 
             # Handle duplicates
             if merge_duplicates:
-                task = progress.add_task(
-                    "Finding duplicate bookmarks...", total=1)
-                duplicates = validator.find_duplicates(bookmarks)
-                progress.update(task, advance=1)
+                duplicates = validator.find_duplicates(
+                    bookmarks, entries=entries)
+                progress.update(duplicates_task, completed=1)
 
                 if duplicates:
-                    task = progress.add_task(
-                        "Merging duplicate bookmarks...", total=1)
                     bookmarks = organizer.merge_duplicates(
                         bookmarks, duplicates)
-                    progress.update(task, advance=1)
                     console.print(
                         f"Merged {sum(len(group) - 1 for group in duplicates.values())} duplicate bookmarks")
+                progress.update(merge_task, completed=1)
 
             # Categorize bookmarks
-            task = progress.add_task(
-                "Analyzing and categorizing bookmarks...", total=1)
             categories = analyzer.categorize(bookmarks)
-            progress.update(task, advance=1)
+            progress.update(categorize_task, completed=1)
 
             # Create organized structure
-            task = progress.add_task(
-                "Creating optimized folder structure...", total=1)
             organized = organizer.organize(bookmarks, categories)
-            progress.update(task, advance=1)
+            progress.update(organize_task, completed=1)
 
             # Export the result
-            task = progress.add_task(
-                f"Exporting to {export_format}...", total=1)
             if export_format.lower() == "html":
-                exporter.export_html(organized, output_path)
+                # Count while writing rather than walking the tree again
+                count = exporter.export_html_with_counts(
+                    organized, output_path)
             elif export_format.lower() == "json":
                 exporter.export_json(organized, output_path)
+                count = parser.count_bookmarks_and_folders(organized)
             else:
                 console.print(
                     f"[bold red]Unsupported format:[/] {export_format}")
                 raise typer.Exit(code=1)
-            progress.update(task, advance=1)
+            progress.update(export_task, completed=1)
 
         # Summary
-        count = parser.count_bookmarks_and_folders(organized)
         console.print(
             f"\n[green]Successfully organized[/] {count['bookmarks']} bookmarks into {count['folders']} folders")
         console.print(f"Created {len(categories)} categories")
@@ -3,13 +3,89 @@ Bookmark Organizer Module
 
 Organizes bookmarks into a more structured and meaningful hierarchy.
 """
-import copy
+import functools
 import logging
+import re
 from collections import defaultdict
-from typing import Dict, List, Any, Set, Tuple, Optional
+from typing import AbstractSet, Dict, Iterator, List, Any, Tuple, Optional
+from urllib.parse import urlparse
 
 from tqdm import tqdm
 
+# Netloc characters that need urlparse's handling rather than the fast path
+_UNUSUAL_NETLOC_RE = re.compile(r'[\[\]\t\n\r]')
+
+# Alphabetical subfolder for each ASCII character: the uppercase letter for
+# letters, '#' for everything else
+_ASCII_LETTER_GROUPS = tuple(
+    chr(code).upper() if chr(code).isalpha() else '#' for code in range(128))
+
+
+def _copy_bookmark(bookmark: Dict[str, Any], folder_path: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Copy a bookmark dictionary, recording the folder it came from.
+
+    Bookmarks hold only strings and ints apart from the tags list, so copying
+    that list is enough to make a fully independent copy without going
+    through copy.deepcopy. The folder path tuple is immutable and is shared
+    between sibling bookmarks.
+
+    Args:
+        bookmark: Bookmark dictionary
+        folder_path: Titles of the folders containing the bookmark
+
+    Returns:
+        Copy of the bookmark with its folder path
+    """
+    result = bookmark.copy()
+    result['folderPath'] = folder_path
+
+    tags = bookmark.get('tags')
+    if tags is not None:
+        result['tags'] = list(tags)
+
+    return result
+
+
+@functools.lru_cache(maxsize=65536)
+def _extract_domain(url: str) -> str:
+    """
+    Extract domain from a URL.
+
+    Args:
+        url: URL string
+
+    Returns:
+        Domain string, without any www. prefix
+    """
+    # Fast path for plain http(s) URLs; the netloc ends at the first
+    # path, query or fragment delimiter, just as urlparse splits it
+    if url.startswith(('http://', 'https://')):
+        rest = url.partition('://')[2]
+        end = len(rest)
+        for delimiter in '/?#':
+            index = rest.find(delimiter, 0, end)
+            if index != -1:
+                end = index
+        domain = rest[:end]
+
+        # Leave bracketed IPv6 hosts, which urlparse validates, and stray
+        # tabs or newlines, which it strips, to the general parser
+        if not _UNUSUAL_NETLOC_RE.search(domain):
+            domain = domain.lower()
+            return domain[4:] if domain.startswith('www.') else domain
+
+    try:
+        domain = urlparse(url).netloc.lower()
+    except ValueError:
+        return ""
+
+    # Remove www. prefix if present
+    if domain.startswith('www.'):
+        domain = domain[4:]
+
+    return domain
+
 
 class BookmarkOrganizer:
     """Organizer for bookmark data to create a better folder structure."""
@@ -35,19 +111,23 @@ class BookmarkOrganizer:
         Returns:
             New bookmark structure
         """
-        # Create a deep copy to avoid modifying the original
-        organized = copy.deepcopy(bookmarks)
-
-        # Create a set of all bookmarks to track which ones have been categorized
-        all_bookmarks = []
-        self._extract_all_bookmarks(bookmarks, all_bookmarks)
+        # Rebuild the root instead of deep copying the whole tree. Existing
+        # folders are shared with the input; nothing below modifies them.
+        if preserve_existing:
+            organized = {**bookmarks, 'children': list(bookmarks['children'])}
+        else:
+            organized = {**bookmarks, 'children': []}
 
-        # Create a set of URLs for quick lookup
-        all_urls = {bookmark.get(
-            'url', ''): bookmark for bookmark in all_bookmarks if bookmark.get('url')}
+        # Index the original bookmarks by URL. They are copied only once, when
+        # placed into their new folder.
+        all_urls = {}
+        for bookmark, folder_path in self._extract_all_bookmarks(bookmarks):
+            url = bookmark.get('url')
+            if url:
+                all_urls[url] = (bookmark, folder_path)
 
-        # Track which bookmarks have been assigned to a category
-        assigned_urls = set()
+        # Bookmarks not yet assigned to a category, in their original order
+        unassigned = dict(all_urls)
 
         # Clean up the root folder's children (we'll rebuild it)
         # Keep any non-bookmark-related items
@@ -56,7 +136,6 @@ class BookmarkOrganizer:
             root_children = organized['children']
         else:
             # Start fresh
-            organized['children'] = []
             root_children = []
 
         # Add category folders
@@ -90,12 +169,13 @@ class BookmarkOrganizer:
 
                     # Add each bookmark to this subfolder
                     for bookmark in subfolder_bookmarks:
-                        url = bookmark.get('url', '')
-                        if url and url in all_urls:
+                        url = bookmark.get('url')
+                        entry = all_urls.get(url)
+                        if entry is not None:
                             # Add a copy of the bookmark
                             subfolder['children'].append(
-                                copy.deepcopy(all_urls[url]))
-                            assigned_urls.add(url)
+                                _copy_bookmark(*entry))
+                            unassigned.pop(url, None)
 
                     # Only add non-empty subfolders
                     if subfolder['children']:
@@ -103,12 +183,13 @@ class BookmarkOrganizer:
             else:
                 # Add bookmarks directly to the category folder
                 for bookmark in bookmarks_in_category:
-                    url = bookmark.get('url', '')
-                    if url and url in all_urls:
+                    url = bookmark.get('url')
+                    entry = all_urls.get(url)
+                    if entry is not None:
                         # Add a copy of the bookmark
                         category_folder['children'].append(
-                            copy.deepcopy(all_urls[url]))
-                        assigned_urls.add(url)
+                            _copy_bookmark(*entry))
+                        unassigned.pop(url, None)
 
             # Only add non-empty category folders
             if category_folder['children']:
@@ -120,10 +201,7 @@ class BookmarkOrganizer:
                     root_children.append(category_folder)
 
         # Create an "Uncategorized" folder for remaining bookmarks
-        uncategorized = []
-        for url, bookmark in all_urls.items():
-            if url and url not in assigned_urls:
-                uncategorized.append(copy.deepcopy(bookmark))
+        uncategorized = [_copy_bookmark(*entry) for entry in unassigned.values()]
 
         if uncategorized:
             uncategorized_folder = {
@@ -143,9 +221,7 @@ class BookmarkOrganizer:
             organized['children'] = root_children
 
         # Sort all folders alphabetically
-        self._sort_folders(organized)
-
-        return organized
+        return self._sort_folders(organized)
 
     def _create_subfolders(self,
                            bookmarks: List[Dict[str, Any]],
@@ -205,11 +281,15 @@ class BookmarkOrganizer:
             if not title:
                 continue
 
-            first_letter = title[0].upper() if title else '#'
+            first_char = title[0]
+            if first_char < '\x80':
+                first_letter = _ASCII_LETTER_GROUPS[ord(first_char)]
+            else:
+                first_letter = first_char.upper()
 
-            # Group non-alphabetic characters
-            if not first_letter.isalpha():
-                first_letter = '#'
+                # Group non-alphabetic characters
+                if not first_letter.isalpha():
+                    first_letter = '#'
 
             alpha_groups[first_letter].append(bookmark)
 
@@ -252,19 +332,7 @@ class BookmarkOrganizer:
         Returns:
             Domain string
         """
-        try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-
-            # Remove www. prefix if present
-            if domain.startswith('www.'):
-                domain = domain[4:]
-
-            return domain
-        except:
-            return ""
+        return _extract_domain(url)
 
     def _format_domain_name(self, domain: str) -> str:
         """
@@ -287,62 +355,86 @@ class BookmarkOrganizer:
         return name.capitalize()
 
     def _extract_all_bookmarks(self,
-                               bookmark_data: Dict[str, Any],
-                               result: List[Dict[str, Any]],
-                               current_path: List[str] = None) -> None:
+                               bookmark_data: Dict[str, Any]
+                               ) -> Iterator[Tuple[Dict[str, Any], Tuple[str, ...]]]:
         """
-        Extract all bookmarks from nested structure into a flat list.
+        Iterate over all bookmarks in a nested structure.
+
+        Bookmarks are not copied; each one is paired with its folder path,
+        and siblings share the same path tuple. The tree is walked with an
+        explicit stack in document order.
 
         Args:
             bookmark_data: The bookmark data structure
-            result: The list to append bookmarks to
-            current_path: The current folder path
+
+        Yields:
+            (bookmark, folder path) pairs
         """
-        if current_path is None:
-            current_path = []
+        if bookmark_data['type'] != 'folder':
+            return
 
-        if bookmark_data['type'] == 'folder':
-            folder_path = current_path + [bookmark_data['title']]
+        stack = [(bookmark_data, ())]
 
-            for child in bookmark_data.get('children', []):
-                if child['type'] == 'bookmark':
-                    # Add folder path information to bookmark
-                    child_copy = child.copy()
-                    child_copy['folderPath'] = folder_path
-                    result.append(child_copy)
-                else:  # It's a folder
-                    self._extract_all_bookmarks(child, result, folder_path)
-
-    def _sort_folders(self, folder: Dict[str, Any]) -> None:
+        while stack:
+            node, path = stack.pop()
+
+            if node['type'] == 'folder':
+                folder_path = path + (node['title'],)
+
+                # Push in reverse so children come off the stack in document order
+                for child in reversed(node.get('children', [])):
+                    stack.append((child, folder_path))
+            else:  # It's a bookmark
+                yield node, path
+
+    def _sort_folders(self, folder: Dict[str, Any]) -> Dict[str, Any]:
         """
         Sort folders and their children alphabetically.
 
+        Folders are rebuilt rather than sorted in place, so folders shared
+        with the caller's original tree are left untouched. The tree is
+        walked with an explicit stack.
+
         Args:
             folder: Folder dictionary to sort
+
+        Returns:
+            Sorted copy of the folder
         """
         if folder['type'] != 'folder':
-            return
+            return folder
+
+        root = {**folder, 'children': []}
+        stack = [(folder, root)]
 
-        # Sort direct children
-        children = folder.get('children', [])
+        while stack:
+            source, target = stack.pop()
+            children = source.get('children', [])
 
-        # Separate folders and bookmarks
-        folders = [child for child in children if child['type'] == 'folder']
-        bookmarks = [
-            child for child in children if child['type'] == 'bookmark']
+            # Separate folders and bookmarks in one pass, pairing each
+            # subfolder with its copy
+            folders = []
+            bookmarks = []
+            for child in children:
+                child_type = child['type']
+                if child_type == 'folder':
+                    folders.append((child, {**child, 'children': []}))
+                elif child_type == 'bookmark':
+                    bookmarks.append(child)
 
-        # Sort folders by title
-        folders.sort(key=lambda x: x['title'].lower())
+            # Sort folders by title
+            folders.sort(key=lambda pair: pair[0]['title'].lower())
 
-        # Sort bookmarks by title
-        bookmarks.sort(key=lambda x: x['title'].lower())
+            # Sort bookmarks by title
+            bookmarks.sort(key=lambda x: x['title'].lower())
 
-        # Update children list
-        folder['children'] = folders + bookmarks
+            # Update children list
+            target['children'] = [folder_copy for _, folder_copy in folders] + bookmarks
 
-        # Recursively sort subfolders
-        for subfolder in folders:
-            self._sort_folders(subfolder)
+            # Sort subfolders next
+            stack.extend(folders)
+
+        return root
 
     def remove_broken_links(self,
                             bookmarks: Dict[str, Any],
@@ -357,43 +449,55 @@ class BookmarkOrganizer:
         Returns:
             Bookmark structure without broken links
         """
-        # Create a deep copy
-        result = copy.deepcopy(bookmarks)
-
-        # Create a set of broken URLs for quick lookup
-        broken_urls = {link.get('url', '') for link in broken_links}
+        # Create a set of broken URLs for quick lookup, leaving out
+        # entries without a URL
+        broken_urls = frozenset(
+            url for url in (link.get('url') for link in broken_links) if url)
 
         # Remove broken links
-        self._remove_broken_recursive(result, broken_urls)
+        return self._remove_urls(bookmarks, broken_urls)
 
-        return result
-
-    def _remove_broken_recursive(self, folder: Dict[str, Any], broken_urls: Set[str]) -> None:
+    def _remove_urls(self,
+                     folder: Dict[str, Any],
+                     remove_urls: AbstractSet[str]) -> Dict[str, Any]:
         """
-        Recursively remove broken links from a folder.
+        Rebuild a folder without the bookmarks pointing at the given URLs.
+
+        Only the folder dicts and their children lists are copied; bookmarks
+        are shared with the original tree, which is left unmodified. The tree
+        is walked with an explicit stack.
 
         Args:
             folder: Folder dictionary
-            broken_urls: Set of broken URLs
+            remove_urls: Set of URLs to remove
+
+        Returns:
+            Filtered copy of the folder
         """
         if folder['type'] != 'folder':
-            return
+            return folder
 
-        # Filter out broken links
-        children = folder.get('children', [])
-        filtered_children = []
+        root = {**folder, 'children': []}
+        stack = [(folder, root)]
 
-        for child in children:
-            if child['type'] == 'bookmark':
-                if child.get('url', '') not in broken_urls:
+        while stack:
+            source, target = stack.pop()
+            filtered_children = target['children']
+
+            # Filter out the removed bookmarks
+            for child in source.get('children', []):
+                if child['type'] == 'bookmark':
+                    if child.get('url') not in remove_urls:
+                        filtered_children.append(child)
+                elif child['type'] == 'folder':
+                    # Add an empty copy now and fill it in when it's popped
+                    child_copy = {**child, 'children': []}
+                    filtered_children.append(child_copy)
+                    stack.append((child, child_copy))
+                else:
                     filtered_children.append(child)
-            else:  # It's a folder
-                # Add the folder (we'll process it recursively)
-                filtered_children.append(child)
-                self._remove_broken_recursive(child, broken_urls)
 
-        # Update children list
-        folder['children'] = filtered_children
+        return root
 
     def merge_duplicates(self,
                          bookmarks: Dict[str, Any],
@@ -408,9 +512,6 @@ class BookmarkOrganizer:
         Returns:
             Bookmark structure with duplicates merged
         """
-        # Create a deep copy
-        result = copy.deepcopy(bookmarks)
-
         # For each duplicate group, decide which bookmark to keep
         keep_urls = set()
         remove_urls = set()
@@ -434,9 +535,7 @@ class BookmarkOrganizer:
                     remove_urls.add(dupe_url)
 
         # Remove duplicates from the structure
-        self._remove_duplicates_recursive(result, remove_urls)
-
-        return result
+        return self._remove_urls(bookmarks, frozenset(remove_urls))
 
     def _choose_best_bookmark(self, duplicates: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -456,9 +555,7 @@ class BookmarkOrganizer:
             return duplicates[0]
 
         # Choose the one with the most complete data
-        scored_bookmarks = []
-
-        for bookmark in duplicates:
+        def score(bookmark: Dict[str, Any]) -> int:
             score = 0
 
             # Prefer bookmarks with titles
@@ -477,37 +574,7 @@ class BookmarkOrganizer:
             if bookmark.get('dateAdded', 0) > 0:
                 score += 1
 
-            scored_bookmarks.append((score, bookmark))
-
-        # Sort by score (descending)
-        scored_bookmarks.sort(reverse=True)
-
-        # Return the highest-scored bookmark
-        return scored_bookmarks[0][1]
-
-    def _remove_duplicates_recursive(self, folder: Dict[str, Any], remove_urls: Set[str]) -> None:
-        """
-        Recursively remove duplicate bookmarks from a folder.
-
-        Args:
-            folder: Folder dictionary
-            remove_urls: Set of URLs to remove
-        """
-        if folder['type'] != 'folder':
-            return
-
-        # Filter out duplicates
-        children = folder.get('children', [])
-        filtered_children = []
-
-        for child in children:
-            if child['type'] == 'bookmark':
-                if child.get('url', '') not in remove_urls:
-                    filtered_children.append(child)
-            else:  # It's a folder
-                # Add the folder (we'll process it recursively)
-                filtered_children.append(child)
-                self._remove_duplicates_recursive(child, remove_urls)
+            return score
 
-        # Update children list
-        folder['children'] = filtered_children
+        # Return the highest-scored bookmark; ties go to the first one
+        return max(duplicates, key=score)
@@ -5,11 +5,271 @@ Handles parsing of HTML bookmark files from various browsers.
 """
 import re
 import datetime
+from html import unescape
+from html.entities import html5 as _HTML5_ENTITIES
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Mapping, Union, Optional, Tuple
 
 from bs4 import BeautifulSoup
 
+# How far into the file to look for the doctype and for browser names
+_DOCTYPE_SCAN_LENGTH = 512
+_BROWSER_SCAN_LENGTH = 8192
+
+# Browser names in the order they take precedence when several appear
+_BROWSER_NAMES = ("firefox", "chrome", "edge")
+
+# Doctypes (matched case-sensitively) and browser names (matched in any
+# case), so the head of the file is scanned only once
+_DETECT_RE = re.compile(
+    r"(?P<netscape>(?-i:<!DOCTYPE NETSCAPE-Bookmark-file-1>))"
+    r"|(?P<html5>(?-i:<!DOCTYPE html>))"
+    r"|(?P<browser>firefox|chrome|edge|safari)",
+    re.IGNORECASE)
+
+
+# Tag name and attributes of a raw start tag, tokenized the same way as
+# html.parser does
+_TAG_NAME_RE = re.compile(r"<[a-zA-Z][^\t\n\r\f />\x00]*(?:\s|/(?!>))*")
+_ATTRIBUTE_RE = re.compile(
+    r"((?<=['\"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*"
+    r"('[^']*'|\"[^\"]*\"|(?!['\"])[^>\s]*))?(?:\s|/(?!>))*")
+
+# Character references, as matched by html.unescape()
+_CHARREF_RE = re.compile(r"&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+
+
+def _replace_attribute_charref(match: "re.Match") -> str:
+    """
+    Decode one character reference found in an attribute value.
+
+    Args:
+        match: Match of _CHARREF_RE
+
+    Returns:
+        The decoded text, or the reference unchanged if it isn't decoded
+    """
+    name = match.group(1)
+    if name[0] == "#":
+        # Numeric references are decoded the same way everywhere
+        return unescape(match.group())
+
+    # Use the longest entity name that prefixes the reference
+    for length in range(len(name), 1, -1):
+        entity = name[:length]
+        if entity in _HTML5_ENTITIES:
+            rest = name[length:]
+
+            # In attributes, a legacy name without ';' followed by a letter,
+            # digit or '=' is left alone, so URLs like ?a=1&region=us survive
+            if not entity.endswith(";") and rest and (
+                    rest[0] == "=" or (rest[0].isascii() and rest[0].isalnum())):
+                return match.group()
+
+            return _HTML5_ENTITIES[entity] + rest
+
+    return match.group()
+
+
+def _parse_attributes(start_tag: str) -> Dict[str, str]:
+    """
+    Read the attributes of a raw start tag.
+
+    html.parser decodes attribute values like text, expanding legacy entity
+    names such as &reg even inside words. Values are decoded here with the
+    HTML5 rules for attributes instead, which is what browsers and html5lib
+    do.
+
+    Args:
+        start_tag: Start tag as it appears in the document
+
+    Returns:
+        Attribute values by lowercased name; the first of repeated
+        attributes is kept
+    """
+    attrs: Dict[str, str] = {}
+    position = _TAG_NAME_RE.match(start_tag).end()
+
+    while position < len(start_tag):
+        match = _ATTRIBUTE_RE.match(start_tag, position)
+        if not match:
+            break
+        name, rest, value = match.group(1, 2, 3)
+
+        if not rest:
+            value = ""
+        elif value[:1] == "'" == value[-1:] or value[:1] == '"' == value[-1:]:
+            value = value[1:-1]
+        if "&" in value:
+            value = _CHARREF_RE.sub(_replace_attribute_charref, value)
+
+        attrs.setdefault(name.lower(), value)
+        position = match.end()
+
+    return attrs
+
+
+def _to_millis(timestamp: Optional[str]) -> int:
+    """
+    Convert a timestamp attribute in seconds to milliseconds.
+
+    Args:
+        timestamp: Attribute value, which may be missing or malformed
+
+    Returns:
+        Timestamp in milliseconds, or 0 if it isn't a valid timestamp
+    """
+    try:
+        seconds = int(timestamp)
+    except (TypeError, ValueError):
+        return 0
+
+    return seconds * 1000 if seconds > 0 else 0
+
+
+class _NetscapeBookmarkParser(HTMLParser):
+    """
+    Streaming parser for the Netscape bookmark file format.
+
+    Folders are DT/H3 entries followed by a nested DL, and bookmarks are DT/A
+    entries. Only the first top-level DL is read, and each DT yields at most
+    one entry: its first H3 if it has one, otherwise its first A.
+    """
+
+    def __init__(self, bookmark_parser: "BookmarkParser", root_folder: Dict[str, Any]):
+        super().__init__(convert_charrefs=True)
+        self._bookmark_parser = bookmark_parser
+        self._root_folder = root_folder
+        self.found_structure = False
+        self._done = False
+
+        # One entry per open DL; None for lists that aren't part of the tree
+        self._folders: List[Optional[Dict[str, Any]]] = []
+
+        # Folder whose DL is expected next, whether the open DT can still take
+        # an H3, and whether it already has an A
+        self._pending_folder: Optional[Dict[str, Any]] = None
+        self._dt_open = False
+        self._dt_has_anchor = False
+
+        # Title and attributes of the open DT's A, added once the DT ends
+        # unless an H3 turns up first
+        self._pending_anchor: Optional[Tuple[str, Dict[str, str]]] = None
+
+        # H3 or A element whose text is being collected
+        self._capture_tag: Optional[str] = None
+        self._capture_attrs: Dict[str, str] = {}
+        self._capture_text: List[str] = []
+        self._capture_split = True
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._done:
+            return
+
+        # Markup inside a title starts a new text node
+        self._capture_split = True
+
+        if tag in ("dt", "dl", "h3", "a"):
+            # These implicitly close an unterminated H3 or A
+            self._finish_capture()
+
+        if tag in ("dt", "dl"):
+            self._add_pending_anchor()
+
+        if tag == "dl":
+            if self.found_structure:
+                self._folders.append(self._pending_folder)
+            else:
+                self.found_structure = True
+                self._folders.append(self._root_folder)
+            self._pending_folder = None
+            self._dt_open = False
+
+        elif tag == "dt":
+            self._pending_folder = None
+            self._dt_open = bool(self._folders) and self._folders[-1] is not None
+            self._dt_has_anchor = False
+
+        elif tag == "h3" and self._dt_open:
+            # A folder takes precedence over a bookmark in the same DT
+            self._dt_open = False
+            self._pending_anchor = None
+            self._start_capture(tag)
+
+        elif tag == "a" and self._dt_open and not self._dt_has_anchor:
+            self._dt_has_anchor = True
+            self._start_capture(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._done:
+            return
+
+        self._capture_split = True
+
+        if tag == self._capture_tag or tag == "dl":
+            self._finish_capture()
+
+        if tag == "dl" and self._folders:
+            self._add_pending_anchor()
+            self._folders.pop()
+            self._pending_folder = None
+            self._dt_open = False
+
+            # Everything after the top-level list is ignored
+            if not self._folders:
+                self._done = True
+
+    def handle_data(self, data: str) -> None:
+        if self._capture_tag is None:
+            return
+
+        # Data can arrive in several chunks for one text node
+        if self._capture_split:
+            self._capture_text.append(data)
+            self._capture_split = False
+        else:
+            self._capture_text[-1] += data
+
+    def handle_comment(self, data: str) -> None:
+        self._capture_split = True
+
+    def close(self) -> None:
+        super().close()
+        self._finish_capture()
+        self._add_pending_anchor()
+
+    def _start_capture(self, tag: str) -> None:
+        """Start collecting the text and attributes of an H3 or A element."""
+        self._capture_tag = tag
+        self._capture_text = []
+        self._capture_attrs = _parse_attributes(self.get_starttag_text())
+
+    def _finish_capture(self) -> None:
+        """Turn the H3 being collected into a folder, or hold on to the A."""
+        tag = self._capture_tag
+        if tag is None:
+            return
+        self._capture_tag = None
+
+        # Same as BeautifulSoup's get_text(strip=True)
+        title = "".join(piece.strip() for piece in self._capture_text)
+
+        if tag == "h3":
+            self._pending_folder = self._bookmark_parser._add_folder(
+                title, self._capture_attrs, self._folders[-1])
+        else:
+            self._pending_anchor = (title, self._capture_attrs)
+
+    def _add_pending_anchor(self) -> None:
+        """Add the bookmark for the DT that just ended, if it had an A."""
+        if self._pending_anchor is None:
+            return
+        title, attrs = self._pending_anchor
+        self._pending_anchor = None
+
+        self._bookmark_parser._add_bookmark(title, attrs, self._folders[-1])
+
 
 class BookmarkParser:
     """Parser for browser bookmark HTML files."""
@@ -49,9 +309,6 @@ class BookmarkParser:
         # Detect browser and parse accordingly
         browser = self._detect_browser(html_content)
 
-        # Create soup object
-        soup = BeautifulSoup(html_content, "html5lib")
-
         # Root folder for the bookmarks
         root_folder = {
             "type": "folder",
@@ -60,15 +317,18 @@ class BookmarkParser:
             "dateAdded": int(datetime.datetime.now().timestamp() * 1000)
         }
 
-        # Parse according to browser format
+        # Parse according to browser format. Netscape format files are
+        # streamed; the others need a full document tree.
         if browser in ["chrome", "edge"]:
-            self._parse_chrome_format(soup, root_folder)
+            self._parse_chrome_format(html_content, root_folder)
         elif browser == "firefox":
-            self._parse_firefox_format(soup, root_folder)
+            self._parse_firefox_format(html_content, root_folder)
         elif browser == "safari":
+            soup = BeautifulSoup(html_content, "html5lib")
             self._parse_safari_format(soup, root_folder)
         else:
             # Generic parsing as fallback
+            soup = BeautifulSoup(html_content, "html5lib")
             self._parse_generic_format(soup, root_folder)
 
         return root_folder
@@ -83,141 +343,111 @@ class BookmarkParser:
         Returns:
             Browser name (chrome, firefox, edge, safari, or generic)
         """
-        html_lower = html_content.lower()
-
-        if "<!DOCTYPE NETSCAPE-Bookmark-file-1>" in html_content and "firefox" in html_lower:
-            return "firefox"
-        elif "<!DOCTYPE NETSCAPE-Bookmark-file-1>" in html_content and "chrome" in html_lower:
-            return "chrome"
-        elif "<!DOCTYPE NETSCAPE-Bookmark-file-1>" in html_content and "edge" in html_lower:
-            return "edge"
-        elif "<!DOCTYPE html>" in html_content and "safari" in html_lower:
-            return "safari"
-        else:
+        # Only the head of the file is scanned, so large files aren't copied
+        # or searched in full
+        netscape = html5 = False
+        names = set()
+        for match in _DETECT_RE.finditer(html_content, 0, _BROWSER_SCAN_LENGTH):
+            kind = match.lastgroup
+            if kind == "browser":
+                names.add(match.group().lower())
+            elif match.end() <= _DOCTYPE_SCAN_LENGTH:
+                if kind == "netscape":
+                    netscape = True
+                else:
+                    html5 = True
+
+        if netscape:
+            for name in _BROWSER_NAMES:
+                if name in names:
+                    return name
+
             # Most bookmark files use the Netscape format
-            if "<!DOCTYPE NETSCAPE-Bookmark-file-1>" in html_content:
-                return "chrome"  # Default to Chrome parsing for Netscape format
+            return "chrome"  # Default to Chrome parsing for Netscape format
 
-            return "generic"
+        if html5 and "safari" in names:
+            return "safari"
+
+        return "generic"
 
-    def _parse_chrome_format(self, soup: BeautifulSoup, root_folder: Dict[str, Any]) -> None:
+    def _parse_chrome_format(self, html_content: str, root_folder: Dict[str, Any]) -> None:
         """
         Parse Chrome/Edge format bookmarks.
 
         Args:
-            soup: BeautifulSoup object of the HTML
+            html_content: HTML string of bookmarks
             root_folder: Root folder dictionary to populate
         """
-        # Find all DL elements (Chrome uses DL/DT/H3 for folders)
-        dl_elements = soup.find_all("dl")
-
-        if not dl_elements:
+        # Chrome uses DL/DT/H3 for folders
+        if not self._parse_netscape_format(html_content, root_folder):
             raise ValueError("No bookmark structure found in Chrome format")
 
-        # Start with the first DL (usually contains all bookmarks)
-        main_dl = dl_elements[0]
-
-        # Process this DL into the root folder
-        self._process_chrome_folder(main_dl, root_folder)
-
-    def _process_chrome_folder(self, dl_element: Any, parent_folder: Dict[str, Any]) -> None:
+    def _parse_firefox_format(self, html_content: str, root_folder: Dict[str, Any]) -> None:
         """
-        Process a Chrome format folder (DL element).
+        Parse Firefox format bookmarks.
 
         Args:
-            dl_element: BeautifulSoup DL element
-            parent_folder: Parent folder dictionary to populate
+            html_content: HTML string of bookmarks
+            root_folder: Root folder dictionary to populate
         """
-        # Get all direct children of the DL
-        children = dl_element.find_all(["dt", "h3"], recursive=False)
-
-        current_folder = parent_folder
-
-        for child in dl_element.children:
-            if child.name == "dt":
-                # This could be a bookmark or a folder
-                h3 = child.find("h3", recursive=False)
-                a = child.find("a", recursive=False)
-
-                if h3:
-                    # This is a folder
-                    folder_name = h3.get_text(strip=True)
-                    date_added = h3.get("add_date", "0")
-                    last_modified = h3.get("last_modified", "0")
-
-                    new_folder = {
-                        "type": "folder",
-                        "title": folder_name,
-                        "children": [],
-                        "dateAdded": int(date_added) * 1000 if date_added.isdigit() else 0,
-                        "lastModified": int(last_modified) * 1000 if last_modified.isdigit() else 0
-                    }
-
-                    parent_folder["children"].append(new_folder)
-
-                    # Process child DL for this folder
-                    child_dl = child.find("dl", recursive=False)
-                    if child_dl:
-                        self._process_chrome_folder(child_dl, new_folder)
-
-                elif a:
-                    # This is a bookmark
-                    self._add_bookmark_from_anchor(a, parent_folder)
+        # Firefox uses the same structure as Chrome
+        if not self._parse_netscape_format(html_content, root_folder):
+            raise ValueError("No bookmark structure found in Firefox format")
 
-    def _parse_firefox_format(self, soup: BeautifulSoup, root_folder: Dict[str, Any]) -> None:
+    def _parse_netscape_format(self, html_content: str, root_folder: Dict[str, Any]) -> bool:
         """
-        Parse Firefox format bookmarks.
+        Stream a Netscape format bookmarks file into the root folder.
 
         Args:
-            soup: BeautifulSoup object of the HTML
+            html_content: HTML string of bookmarks
             root_folder: Root folder dictionary to populate
-        """
-        # Firefox uses a similar structure to Chrome but with some differences
-        dl_elements = soup.find_all("dl")
 
-        if not dl_elements:
-            raise ValueError("No bookmark structure found in Firefox format")
+        Returns:
+            Whether a bookmark list (DL element) was found
+        """
+        # Normalize line breaks and drop NUL characters up front, as an HTML5
+        # parser's input stream would, so they don't end up in titles or URLs
+        if "\r" in html_content:
+            html_content = html_content.replace("\r\n", "\n").replace("\r", "\n")
+        if "\x00" in html_content:
+            html_content = html_content.replace("\x00", "")
 
-        # Start with the first DL
-        main_dl = dl_elements[0]
+        parser = _NetscapeBookmarkParser(self, root_folder)
+        parser.feed(html_content)
+        parser.close()
 
-        # Process this DL into the root folder
-        self._process_firefox_folder(main_dl, root_folder)
+        return parser.found_structure
 
-    def _process_firefox_folder(self, dl_element: Any, parent_folder: Dict[str, Any]) -> None:
+    def _process_chrome_folder(self, dl_element: Any, parent_folder: Dict[str, Any]) -> None:
         """
-        Process a Firefox format folder (DL element).
+        Process a Chrome format folder (DL element).
 
         Args:
             dl_element: BeautifulSoup DL element
             parent_folder: Parent folder dictionary to populate
         """
-        # Similar to Chrome but with Firefox-specific attributes
         for child in dl_element.children:
             if child.name == "dt":
-                h3 = child.find("h3", recursive=False)
-                a = child.find("a", recursive=False)
+                # This could be a bookmark or a folder. Pick out the first
+                # H3, A and DL among the DT's children in a single pass.
+                h3 = a = child_dl = None
+                for grandchild in child.children:
+                    name = grandchild.name
+                    if name == "h3":
+                        h3 = h3 or grandchild
+                    elif name == "a":
+                        a = a or grandchild
+                    elif name == "dl":
+                        child_dl = child_dl or grandchild
 
                 if h3:
                     # This is a folder
-                    folder_name = h3.get_text(strip=True)
-                    date_added = h3.get("add_date", "0")
-                    last_modified = h3.get("last_modified", "0")
-
-                    new_folder = {
-                        "type": "folder",
-                        "title": folder_name,
-                        "children": [],
-                        "dateAdded": int(date_added) * 1000 if date_added.isdigit() else 0,
-                        "lastModified": int(last_modified) * 1000 if last_modified.isdigit() else 0
-                    }
-
-                    parent_folder["children"].append(new_folder)
+                    new_folder = self._add_folder(
+                        h3.get_text(strip=True), h3, parent_folder)
 
                     # Process child DL for this folder
-                    child_dl = child.find("dl", recursive=False)
                     if child_dl:
-                        self._process_firefox_folder(child_dl, new_folder)
+                        self._process_chrome_folder(child_dl, new_folder)
 
                 elif a:
                     # This is a bookmark
@@ -253,9 +483,9 @@ class BookmarkParser:
         # Try several common patterns
 
         # 1. Try DL/DT pattern (most common)
-        dl_elements = soup.find_all("dl")
-        if dl_elements:
-            self._process_chrome_folder(dl_elements[0], root_folder)
+        main_dl = soup.find("dl")
+        if main_dl is not None:
+            self._process_chrome_folder(main_dl, root_folder)
             return
 
         # 2. Try direct anchor tags
@@ -263,6 +493,33 @@ class BookmarkParser:
         for a in a_elements:
             self._add_bookmark_from_anchor(a, root_folder)
 
+    def _add_folder(self,
+                    title: str,
+                    attrs: Mapping[str, str],
+                    parent_folder: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a folder entry from an H3 element's title and attributes.
+
+        Args:
+            title: Folder title
+            attrs: Attributes of the H3 element
+            parent_folder: Parent folder dictionary to populate
+
+        Returns:
+            The new folder dictionary
+        """
+        new_folder = {
+            "type": "folder",
+            "title": title,
+            "children": [],
+            "dateAdded": _to_millis(attrs.get("add_date")),
+            "lastModified": _to_millis(attrs.get("last_modified"))
+        }
+
+        parent_folder["children"].append(new_folder)
+
+        return new_folder
+
     def _add_bookmark_from_anchor(self, a_tag: Any, parent_folder: Dict[str, Any]) -> None:
         """
         Create a bookmark entry from an anchor tag.
@@ -271,26 +528,38 @@ class BookmarkParser:
             a_tag: BeautifulSoup A element
             parent_folder: Parent folder dictionary to populate
         """
-        title = a_tag.get_text(strip=True)
-        url = a_tag.get("href", "")
+        self._add_bookmark(a_tag.get_text(strip=True), a_tag, parent_folder)
+
+    def _add_bookmark(self,
+                      title: str,
+                      attrs: Mapping[str, str],
+                      parent_folder: Dict[str, Any]) -> None:
+        """
+        Create a bookmark entry from an anchor's text and attributes.
+
+        Args:
+            title: Anchor text
+            attrs: Attributes of the A element
+            parent_folder: Parent folder dictionary to populate
+        """
+        url = attrs.get("href", "")
 
         # Skip javascript: URLs, about:, chrome:, etc.
         if not url or url.startswith(("javascript:", "about:", "chrome:", "edge:", "file:")):
             return
 
         # Get metadata
-        date_added = a_tag.get("add_date", a_tag.get("added", "0"))
-        last_modified = a_tag.get("last_modified", "0")
-        icon = a_tag.get("icon", "")
-        tags = a_tag.get("tags", "")
+        date_added = attrs.get("add_date", attrs.get("added"))
+        icon = attrs.get("icon", "")
+        tags = attrs.get("tags", "")
 
         # Create bookmark object
         bookmark = {
             "type": "bookmark",
             "title": title or "Untitled Bookmark",
             "url": url,
-            "dateAdded": int(date_added) * 1000 if date_added.isdigit() else 0,
-            "lastModified": int(last_modified) * 1000 if last_modified.isdigit() else 0
+            "dateAdded": _to_millis(date_added),
+            "lastModified": _to_millis(attrs.get("last_modified"))
         }
 
         # Add optional fields if present
@@ -312,19 +581,18 @@ class BookmarkParser:
         Returns:
             Dictionary with counts
         """
-        result = {"bookmarks": 0, "folders": 0}
+        bookmark_count = 0
+        folder_count = 0
 
-        def count_recursive(item):
+        # Walk the tree with an explicit stack
+        stack = [bookmarks]
+        while stack:
+            item = stack.pop()
             if item["type"] == "folder":
-                result["folders"] += 1
-                for child in item.get("children", []):
-                    count_recursive(child)
+                folder_count += 1
+                stack.extend(item.get("children", ()))
             else:  # bookmark
-                result["bookmarks"] += 1
-
-        count_recursive(bookmarks)
+                bookmark_count += 1
 
         # Don't count the root folder
-        result["folders"] -= 1
-
-        return result
+        return {"bookmarks": bookmark_count, "folders": folder_count - 1}
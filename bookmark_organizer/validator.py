@@ -3,17 +3,163 @@ Bookmark Validator Module
 
 Validates bookmarks by checking for broken links and finding duplicates.
 """
-import concurrent.futures
+import asyncio
+import functools
+import itertools
 import hashlib
 import logging
-import re
+import os
+import sqlite3
+import sys
 import time
-from collections import defaultdict
-from typing import Dict, List, Any, Set, Tuple, Optional
-from urllib.parse import urlparse
+from collections import defaultdict, deque
+from typing import Dict, Iterable, Iterator, List, Any, NamedTuple, Set, Tuple, Optional
+from urllib.parse import ParseResult, parse_qsl, urlencode, urljoin, urlparse
+
+import aiohttp
+from tqdm.asyncio import tqdm
+
+# Transient gateway errors worth retrying before reporting a link as broken
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_RETRY_BACKOFF = 0.2
+
+# Redirect hops followed before a link is reported as broken
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+# Hosts known to reject or mishandle HEAD requests, checked with GET directly
+_GET_ONLY_HOSTS = frozenset({'linkedin.com', 'medium.com', 'facebook.com',
+                             'instagram.com', 'twitter.com', 'x.com',
+                             'amazon.com', 'quora.com'})
+
+# URL prefixes that can't be checked over HTTP
+_NON_WEB_SCHEMES = ('javascript:', 'file:', 'chrome:', 'edge:', 'about:',
+                    'mailto:', 'data:', 'tel:')
+
+# Common tracking parameters dropped when comparing URLs
+_TRACKING_PARAMS = frozenset({'utm_source', 'utm_medium', 'utm_campaign', 'utm_term',
+                              'utm_content', 'fbclid', 'gclid', 'ref', 'source',
+                              'ref_src', 'ref_url', '_ga'})
+
+# Headers sent with every link check (the User-Agent is added per validator)
+_REQUEST_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'DNT': '1',  # Do Not Track
+}
+
+# HEAD responses have no body, so don't ask the server to prepare a compressed one
+_HEAD_HEADERS = {'Accept-Encoding': 'identity'}
+_GET_HEADERS = {'Accept-Encoding': 'gzip'}
+
+# Default location of the persistent link status cache
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'bookmark-organizer', 'status.db')
+
+# Number of cache rows written per commit
+_CACHE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
 
-import requests
-from tqdm import tqdm
+
+def _is_https_upgrade(url: str, next_url: str) -> bool:
+    """
+    Check whether a redirect only switches a URL from http to https.
+
+    Args:
+        url: URL that was requested
+        next_url: Absolute URL the response redirects to
+
+    Returns:
+        True if only the scheme changes, False otherwise
+    """
+    try:
+        current = urlparse(url)
+        target = urlparse(next_url)
+    except ValueError:
+        return False
+
+    return (current.scheme == 'http'
+            and target.scheme == 'https'
+            and current.netloc.lower() == target.netloc.lower()
+            and (current.path or '/') == (target.path or '/')
+            and current.params == target.params
+            and current.query == target.query)
+
+
+class ParsedBookmark(NamedTuple):
+    """A bookmark whose URL has been parsed once for the link-checking pipeline."""
+    bookmark: Dict[str, Any]
+    path: Tuple[str, ...]
+    parsed: ParseResult
+    netloc: str
+    normalized_url: str
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_url(url: str) -> str:
+    """
+    Normalize URL for comparison purposes.
+
+    Args:
+        url: URL string
+
+    Returns:
+        Normalized URL
+    """
+    try:
+        return _normalize_parsed(urlparse(url))
+
+    except Exception as e:
+        # If parsing fails, return the original URL
+        logger.warning(f"URL normalization failed for {url}: {e}")
+        return url
+
+
+def _normalize_parsed(parsed: ParseResult) -> str:
+    """
+    Normalize an already parsed URL for comparison purposes.
+
+    Args:
+        parsed: Result of urlparse
+
+    Returns:
+        Normalized URL
+    """
+    # Convert to lowercase
+    netloc = parsed.netloc.lower()
+
+    # Remove www. prefix
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+
+    # Remove trailing slashes from path
+    path = parsed.path.rstrip('/')
+
+    # Some sites use different protocols but are the same resource
+    # Standardize on https for comparison
+    scheme = 'https'
+
+    # Ignore most query parameters for certain sites
+    pairs = parse_qsl(parsed.query, keep_blank_values=True)
+    if 'youtube.com' in netloc or 'youtu.be' in netloc:
+        # For YouTube, only keep the video ID
+        video = [(name, value) for name, value in pairs if name == 'v'][:1]
+        if video:
+            pairs = video
+
+    # Remove tracking parameters
+    query = urlencode([(name, value) for name, value in pairs
+                       if name.lower() not in _TRACKING_PARAMS])
+
+    # Reconstruct the normalized URL
+    normalized = f"{scheme}://{netloc}{path}"
+
+    # Add query string if it exists
+    if query:
+        normalized += f"?{query}"
+
+    return normalized
 
 
 class BookmarkValidator:
@@ -22,7 +168,11 @@ class BookmarkValidator:
     def __init__(self,
                 concurrency: int = 10,
                 timeout: int = 5,
-                user_agent: str = "Mozilla/5.0 (compatible; BookmarkOrganizer/0.1)"):
+                user_agent: str = "Mozilla/5.0 (compatible; BookmarkOrganizer/0.1)",
+                per_host_limit: int = 2,
+                max_retries: int = 2,
+                cache_path: Optional[str] = None,
+                cache_ttl: float = 86400):
         """
         Initialize the bookmark validator.
 
@@ -30,89 +180,318 @@ class BookmarkValidator:
             concurrency: Number of concurrent requests when checking links
             timeout: Timeout for HTTP requests in seconds
             user_agent: User agent string for HTTP requests
+            per_host_limit: Maximum number of concurrent requests to a single host
+            max_retries: Number of retries for transient gateway errors (502/503/504)
+            cache_path: Path to a SQLite file for caching link status between runs
+                (None disables the cache)
+            cache_ttl: Seconds a cached working status is trusted before it is
+                revalidated. Failures are always checked again.
         """
         self.logger = logging.getLogger(__name__)
         self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
         self.timeout = timeout
         self.user_agent = user_agent
 
-        # Headers for HTTP requests
-        self.headers = {
-            'User-Agent': user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'DNT': '1',  # Do Not Track
-        }
+        # Hosts to check with GET only, extended as servers reject HEAD
+        self._get_only_hosts = set(_GET_ONLY_HOSTS)
+
+        # Persistent link status cache
+        self.cache_ttl = cache_ttl
+        self._cache = self._open_cache(cache_path) if cache_path else None
+        self._cache_pending = []
 
-        # Create a session object for connection pooling
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+    def __enter__(self) -> 'BookmarkValidator':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Write any queued statuses and close the link status cache."""
+        if self._cache is None:
+            return
+
+        try:
+            self._flush_cache()
+        finally:
+            self._cache.close()
+            self._cache = None
+
+    def _open_cache(self, cache_path: str) -> sqlite3.Connection:
+        """
+        Open (and create if needed) the link status cache database.
+
+        Args:
+            cache_path: Path to the SQLite file
+
+        Returns:
+            Open SQLite connection
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+
+        connection = sqlite3.connect(cache_path)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS link_status ('
+            'url TEXT PRIMARY KEY, status INT, etag TEXT, '
+            'last_modified TEXT, checked_at REAL)'
+        )
+        connection.commit()
+
+        return connection
+
+    def _cache_lookup(self, url: str) -> Optional[Tuple[int, Optional[str], Optional[str], float]]:
+        """
+        Look up the cached status of a URL.
+
+        Args:
+            url: URL string
+
+        Returns:
+            Tuple of (status, etag, last_modified, checked_at), or None if not cached
+        """
+        if self._cache is None:
+            return None
+
+        return self._cache.execute(
+            'SELECT status, etag, last_modified, checked_at FROM link_status WHERE url = ?',
+            (url,)
+        ).fetchone()
+
+    def _cache_store(self,
+                     url: str,
+                     status: int,
+                     etag: Optional[str],
+                     last_modified: Optional[str]) -> None:
+        """
+        Queue a URL status for writing to the cache.
+
+        Args:
+            url: URL string
+            status: HTTP status code
+            etag: ETag header of the response, if any
+            last_modified: Last-Modified header of the response, if any
+        """
+        if self._cache is None:
+            return
+
+        self._cache_pending.append((url, status, etag, last_modified, time.time()))
+
+        if len(self._cache_pending) >= _CACHE_BATCH_SIZE:
+            self._flush_cache()
+
+    def _flush_cache(self) -> None:
+        """Write queued URL statuses to the cache in a single transaction."""
+        if self._cache is None or not self._cache_pending:
+            return
+
+        self._cache.executemany(
+            'INSERT OR REPLACE INTO link_status VALUES (?, ?, ?, ?, ?)',
+            self._cache_pending
+        )
+        self._cache.commit()
+        self._cache_pending = []
 
     def find_broken_links(self, bookmarks: Dict[str, Any],
-                         show_progress: bool = True) -> List[Dict[str, Any]]:
+                         show_progress: bool = True,
+                         entries: Optional[Iterable[Tuple[Dict[str, Any], Tuple[str, ...]]]] = None
+                         ) -> List[Dict[str, Any]]:
         """
         Check for broken links in the bookmarks.
 
         Args:
             bookmarks: Bookmark data structure
             show_progress: Whether to show a progress bar
+            entries: Pre-extracted (bookmark, folder path) pairs from
+                iter_bookmarks, to avoid walking the tree again
 
         Returns:
             List of broken bookmark references
         """
-        # Extract all bookmarks
-        all_bookmarks = []
-        self._extract_all_bookmarks(bookmarks, all_bookmarks)
-
-        # Remove bookmarks with invalid URLs
-        valid_bookmarks = [
-            b for b in all_bookmarks if self._is_valid_url(b.get('url', ''))]
-
-        broken_links = []
-
-        # Use concurrent requests for efficiency
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
-            # Submit all requests
-            future_to_bookmark = {
-                executor.submit(self._check_link, bookmark): bookmark
-                for bookmark in valid_bookmarks
-            }
-
-            # Process results as they complete
-            if show_progress:
-                iterator = tqdm(
-                    concurrent.futures.as_completed(future_to_bookmark),
-                    total=len(future_to_bookmark),
-                    desc="Checking links"
-                )
-            else:
-                iterator = concurrent.futures.as_completed(future_to_bookmark)
-
-            for future in iterator:
-                bookmark = future_to_bookmark[future]
-                try:
-                    is_broken, status = future.result()
-                    if is_broken:
-                        bookmark_copy = bookmark.copy()
-                        bookmark_copy['status'] = status
-                        broken_links.append(bookmark_copy)
-                except Exception as exc:
-                    self.logger.error(
-                        f"Error checking {bookmark.get('url')}: {exc}")
-                    # Count as broken if an exception occurred
-                    bookmark_copy = bookmark.copy()
-                    bookmark_copy['status'] = "Error: " + str(exc)
-                    broken_links.append(bookmark_copy)
+        if entries is None:
+            entries = self.iter_bookmarks(bookmarks)
+
+        # Group bookmarks with valid URLs by normalized URL so each
+        # distinct link is only checked once
+        url_to_group = defaultdict(list)
+        for entry in self._prepare(entries):
+            url_to_group[entry.normalized_url].append(entry)
+
+        # Spread hosts out so a single slow host doesn't hold up the rest
+        groups = self._interleave_by_host(list(url_to_group.values()))
+
+        try:
+            return asyncio.run(self._find_broken_async(groups, show_progress))
+        finally:
+            self._flush_cache()
+
+    def _prepare(self,
+                 entries: Iterable[Tuple[Dict[str, Any], Tuple[str, ...]]]
+                 ) -> List[ParsedBookmark]:
+        """
+        Parse the URL of each checkable bookmark once.
+
+        Bookmarks with URLs that can't be checked over HTTP are dropped.
+
+        Args:
+            entries: (bookmark, folder path) pairs
+
+        Returns:
+            List of parsed bookmarks
+        """
+        prepared = []
+
+        for bookmark, path in entries:
+            url = bookmark.get('url', '')
+            if not url or url.startswith(_NON_WEB_SCHEMES):
+                continue
+
+            try:
+                parsed = urlparse(url)
+            except ValueError:
+                continue
+
+            if not self._is_web_url(parsed):
+                continue
+
+            prepared.append(ParsedBookmark(bookmark,
+                                           path,
+                                           parsed,
+                                           parsed.netloc.lower(),
+                                           _normalize_parsed(parsed)))
+
+        return prepared
+
+    def _interleave_by_host(self,
+                            groups: List[List[ParsedBookmark]]
+                            ) -> List[List[ParsedBookmark]]:
+        """
+        Order URL groups round-robin across hosts.
+
+        Args:
+            groups: Lists of parsed bookmarks sharing a normalized URL
+
+        Returns:
+            Groups reordered so that consecutive entries target different hosts
+        """
+        host_to_bookmarks = defaultdict(deque)
+        for group in groups:
+            host_to_bookmarks[group[0].netloc].append(group)
+
+        ordered = []
+        queues = list(host_to_bookmarks.values())
+
+        # Pop at most one bookmark per host in each round
+        while queues:
+            for queue in queues:
+                ordered.append(queue.popleft())
+            queues = [queue for queue in queues if queue]
+
+        return ordered
+
+    async def _find_broken_async(self,
+                                 groups: List[List[ParsedBookmark]],
+                                 show_progress: bool) -> List[Dict[str, Any]]:
+        """
+        Check bookmarks concurrently on a single event loop.
+
+        Only the first bookmark of each group is requested; its result is
+        applied to every bookmark in the group.
+
+        Args:
+            groups: Lists of parsed bookmarks sharing a normalized URL
+            show_progress: Whether to show a progress bar
+
+        Returns:
+            List of broken bookmark references
+        """
+        # Bound the number of in-flight requests, overall and per host
+        semaphore = asyncio.Semaphore(self.concurrency)
+        host_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(self.per_host_limit))
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=300,
+            # Keep idle connections around for later URLs on the same host
+            keepalive_timeout=30
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        headers = {'User-Agent': self.user_agent, **_REQUEST_HEADERS}
+
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=timeout,
+                                         headers=headers) as session:
+
+            async def check(entry: ParsedBookmark) -> Tuple[bool, str]:
+                # Wait for the host slot first so requests queued on a busy
+                # host don't occupy global slots other hosts could use
+                async with host_semaphores[entry.netloc], semaphore:
+                    try:
+                        return await self._check_link_async(
+                            session, entry.bookmark, entry.parsed)
+                    except Exception as exc:
+                        self.logger.error(
+                            f"Error checking {entry.bookmark.get('url')}: {exc}")
+                        # Count as broken if an exception occurred
+                        return True, "Error: " + str(exc)
+
+            broken_links = []
+
+            # Only keep a bounded number of tasks alive at once; the rest of
+            # the queue is turned into tasks as earlier checks complete
+            pending = iter(groups)
+            task_to_group = {}
+            max_inflight = self.concurrency * 2
+
+            # Throttle redraws, and skip the bar for short runs or when
+            # stderr isn't a terminal
+            with tqdm(total=len(groups),
+                      desc="Checking links",
+                      mininterval=0.25,
+                      miniters=max(1, len(groups) // 200),
+                      smoothing=0.1,
+                      disable=(not show_progress
+                               or len(groups) < 50
+                               or not sys.stderr.isatty())) as progress:
+                while True:
+                    for group in itertools.islice(
+                            pending, max_inflight - len(task_to_group)):
+                        task = asyncio.ensure_future(check(group[0]))
+                        task_to_group[task] = group
+
+                    if not task_to_group:
+                        break
+
+                    done, _ = await asyncio.wait(
+                        task_to_group, return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:
+                        group = task_to_group.pop(task)
+                        is_broken, status = task.result()
+                        if is_broken:
+                            broken_links.extend(
+                                {**entry.bookmark, 'folderPath': entry.path, 'status': status}
+                                for entry in group)
+
+                    progress.update(len(done))
 
         return broken_links
 
-    def _check_link(self, bookmark: Dict[str, Any]) -> Tuple[bool, str]:
+    async def _check_link_async(self,
+                                session: aiohttp.ClientSession,
+                                bookmark: Dict[str, Any],
+                                parsed: Optional[ParseResult] = None) -> Tuple[bool, str]:
         """
         Check if a link is broken by making a HEAD request.
 
         Args:
+            session: Shared aiohttp client session
             bookmark: Bookmark dictionary
+            parsed: The bookmark's parsed URL, if already available
 
         Returns:
             Tuple of (is_broken, status_message)
@@ -121,47 +500,158 @@ class BookmarkValidator:
 
         try:
             # Skip certain URL types
-            if url.startswith(('javascript:', 'file:', 'chrome:', 'edge:', 'about:')):
+            if url.startswith(_NON_WEB_SCHEMES):
                 return False, "Skipped (non-HTTP URL)"
 
-            # Try HEAD request first (faster)
-            response = self.session.head(
-                url,
-                timeout=self.timeout,
-                allow_redirects=True
-            )
-
-            # Some servers don't support HEAD, so if we get 405/404/403, try GET instead
-            if response.status_code in (403, 404, 405):
-                response = self.session.get(
-                    url,
-                    timeout=self.timeout,
-                    allow_redirects=True,
-                    stream=True  # Don't download the full response content
-                )
-
-                # Close the connection to avoid downloading the whole resource
-                response.close()
+            # Reuse a recent cached result, or revalidate an older one.
+            # Only working links are taken from the cache; failures such
+            # as 429 or 503 are often temporary, so they are checked again.
+            conditional_headers = {}
+            etag = last_modified = None
+
+            cached = self._cache_lookup(url)
+            if cached is not None and cached[0] >= 400:
+                cached = None
+
+            if cached is not None:
+                cached_status, etag, last_modified, checked_at = cached
+
+                if time.time() - checked_at < self.cache_ttl:
+                    return False, f"HTTP {cached_status}"
+
+                if etag:
+                    conditional_headers['If-None-Match'] = etag
+                if last_modified:
+                    conditional_headers['If-Modified-Since'] = last_modified
+
+            if parsed is None:
+                parsed = urlparse(url)
+
+            host = parsed.hostname or ''
+            if host.startswith('www.'):
+                host = host[4:]
+
+            if host in self._get_only_hosts:
+                # Skip the HEAD round-trip on hosts that don't support it
+                response = await self._fetch(
+                    session, 'GET', url,
+                    headers={**_GET_HEADERS, **conditional_headers}, read_until_eof=False)
+            else:
+                # Try HEAD request first (faster)
+                response = await self._fetch(
+                    session, 'HEAD', url, headers={**_HEAD_HEADERS, **conditional_headers})
+
+                # Some servers don't support HEAD, so if we get 405, try GET instead
+                # and remember the host so its other links go straight to GET.
+                # A 403/404 from HEAD is final; GET would almost always agree.
+                if response.status == 405:
+                    self._get_only_hosts.add(host)
+
+                    # Don't download the full response content
+                    response = await self._fetch(
+                        session, 'GET', url,
+                        headers={**_GET_HEADERS, **conditional_headers}, read_until_eof=False)
+
+            status_code = response.status
+            if status_code == 304 and cached is not None:
+                # Unchanged since the last check
+                status_code = cached_status
+
+            self._cache_store(url,
+                              status_code,
+                              response.headers.get('ETag', etag),
+                              response.headers.get('Last-Modified', last_modified))
 
             # If status code is in 4xx or 5xx range, the link is broken
-            if response.status_code >= 400:
-                return True, f"HTTP {response.status_code}"
+            if status_code >= 400:
+                return True, f"HTTP {status_code}"
 
-            return False, f"HTTP {response.status_code}"
+            return False, f"HTTP {status_code}"
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             return True, "Timeout"
-        except requests.exceptions.ConnectionError:
-            return True, "Connection Error"
-        except requests.exceptions.TooManyRedirects:
+        except aiohttp.TooManyRedirects:
             return True, "Too Many Redirects"
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientConnectionError:
+            return True, "Connection Error"
+        except aiohttp.ClientError as e:
             return True, str(e)
 
+    async def _fetch(self,
+                     session: aiohttp.ClientSession,
+                     method: str,
+                     url: str,
+                     **kwargs: Any) -> aiohttp.ClientResponse:
+        """
+        Make a request, following redirects manually.
+
+        Stops early when a redirect only upgrades the same URL from http to
+        https, since the link is known to resolve. Any other redirect is
+        followed, even to an equivalent-looking URL, so an error at the
+        target is still caught.
+
+        Args:
+            session: Shared aiohttp client session
+            method: HTTP method (HEAD or GET)
+            url: URL to request
+            **kwargs: Extra arguments passed to each request
+
+        Returns:
+            The final (already released) response
+
+        Raises:
+            aiohttp.TooManyRedirects: If more than _MAX_REDIRECTS hops are needed
+        """
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = await self._request(session, method, url, **kwargs)
+
+            location = response.headers.get('Location')
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+
+            next_url = urljoin(url, location)
+            if _is_https_upgrade(url, next_url):
+                return response
+
+            url = next_url
+
+        raise aiohttp.TooManyRedirects(response.request_info, (), status=response.status)
+
+    async def _request(self,
+                       session: aiohttp.ClientSession,
+                       method: str,
+                       url: str,
+                       **kwargs: Any) -> aiohttp.ClientResponse:
+        """
+        Make a single request without reading its body, retrying transient errors.
+
+        Args:
+            session: Shared aiohttp client session
+            method: HTTP method (HEAD or GET)
+            url: URL to request
+            **kwargs: Extra arguments passed to the request
+
+        Returns:
+            The (already released) response
+        """
+        for attempt in range(self.max_retries + 1):
+            async with session.request(method, url, allow_redirects=False, **kwargs) as response:
+                # Release the connection without reading the body
+                response.release()
+
+            if response.status not in _RETRY_STATUSES or attempt == self.max_retries:
+                break
+
+            await asyncio.sleep(_RETRY_BACKOFF * (2 ** attempt))
+
+        return response
+
     def find_duplicates(self,
                        bookmarks: Dict[str, Any],
                        url_normalize: bool = True,
-                       title_similarity: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+                       title_similarity: bool = True,
+                       entries: Optional[Iterable[Tuple[Dict[str, Any], Tuple[str, ...]]]] = None
+                       ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Find duplicate bookmarks based on URL and title similarity.
 
@@ -169,111 +659,49 @@ class BookmarkValidator:
             bookmarks: Bookmark data structure
             url_normalize: Whether to normalize URLs for comparison
             title_similarity: Whether to use title similarity for edge cases
+            entries: Pre-extracted (bookmark, folder path) pairs from
+                iter_bookmarks, to avoid walking the tree again
 
         Returns:
             Dictionary mapping canonical URLs to lists of duplicate bookmarks
         """
-        # Extract all bookmarks
-        all_bookmarks = []
-        self._extract_all_bookmarks(bookmarks, all_bookmarks)
+        if entries is None:
+            entries = self.iter_bookmarks(bookmarks)
 
-        # Group by normalized URL
-        url_groups = defaultdict(list)
+        # Group by normalized URL in a single pass: a URL only gets a group
+        # (and its bookmarks get copied) once a second occurrence shows up
+        first_seen = {}
+        duplicates = {}
 
-        for bookmark in all_bookmarks:
+        for bookmark, path in entries:
             url = bookmark.get('url', '')
             if not url:
                 continue
 
             # Normalize URL if enabled
             if url_normalize:
-                norm_url = self._normalize_url(url)
+                norm_url = _normalize_url(url)
             else:
                 norm_url = url
 
-            url_groups[norm_url].append(bookmark)
-
-        # Filter to only groups with duplicates
-        duplicates = {url: bookmarks for url,
-            bookmarks in url_groups.items() if len(bookmarks) > 1}
+            group = duplicates.get(norm_url)
+            if group is not None:
+                group.append({**bookmark, 'folderPath': path})
+            elif norm_url in first_seen:
+                first, first_path = first_seen.pop(norm_url)
+                duplicates[norm_url] = [
+                    {**first, 'folderPath': first_path},
+                    {**bookmark, 'folderPath': path},
+                ]
+            else:
+                first_seen[norm_url] = (bookmark, path)
 
         # Apply title similarity for edge cases if enabled
-        if title_similarity and len(all_bookmarks) > 0:
+        if title_similarity and duplicates:
             self._refine_with_title_similarity(duplicates)
 
         return duplicates
 
-    def _normalize_url(self, url: str) -> str:
-        """
-        Normalize URL for comparison purposes.
-
-        Args:
-            url: URL string
-
-        Returns:
-            Normalized URL
-        """
-        try:
-            # Parse URL
-            parsed = urlparse(url)
-
-            # Convert to lowercase
-            netloc = parsed.netloc.lower()
-
-            # Remove www. prefix
-            if netloc.startswith('www.'):
-                netloc = netloc[4:]
-
-            # Remove trailing slashes from path
-            path = parsed.path.rstrip('/')
-
-            # Some sites use different protocols but are the same resource
-            # Standardize on https for comparison
-            scheme = 'https'
-
-            # Ignore most query parameters for certain sites
-            query = parsed.query
-            if ('youtube.com' in netloc or 'youtu.be' in netloc) and 'v=' in query:
-                # For YouTube, only keep the video ID
-                params = dict(pair.split('=')
-                              for pair in query.split('&') if '=' in pair)
-                if 'v' in params:
-                    query = f"v={params['v']}"
-                else:
-                    query = ""
-
-            # Remove tracking parameters
-            if query:
-                query_params = query.split('&')
-                filtered_params = []
-
-                # List of common tracking parameters to remove
-                tracking_params = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term',
-                                   'utm_content', 'fbclid', 'gclid', 'ref', 'source',
-                                   'ref_src', 'ref_url', '_ga'}
-
-                for param in query_params:
-                    if '=' in param:
-                        name = param.split('=')[0]
-                        if name.lower() not in tracking_params:
-                            filtered_params.append(param)
-
-                query = '&'.join(filtered_params)
-
-            # Reconstruct the normalized URL
-            normalized = f"{scheme}://{netloc}{path}"
-
-            # Add query string if it exists
-            if query:
-                normalized += f"?{query}"
-
-            return normalized
-
-        except Exception as e:
-            # If parsing fails, return the original URL
-            self.logger.warning(f"URL normalization failed for {url}: {e}")
-            return url
-
     def _refine_with_title_similarity(self, duplicates: Dict[str, List[Dict[str, Any]]]) -> None:
         """
         Refine duplicate detection using title similarity.
@@ -285,58 +713,54 @@ class BookmarkValidator:
         # For now, we'll just keep the URL-based duplicates
         pass
 
-    def _extract_all_bookmarks(self,
-                              bookmark_data: Dict[str, Any],
-                              result: List[Dict[str, Any]],
-                              current_path: List[str] = None) -> None:
+    def iter_bookmarks(self,
+                       bookmarks: Dict[str, Any]
+                       ) -> Iterator[Tuple[Dict[str, Any], Tuple[str, ...]]]:
         """
-        Extract all bookmarks from nested structure into a flat list.
+        Iterate over all bookmarks in a nested structure.
+
+        Bookmarks are not copied; each one is paired with its folder path,
+        and siblings share the same path tuple. The tree is walked with an
+        explicit stack, so deeply nested folders can't hit the recursion limit.
+        Materialize the result with list() to share one traversal between
+        find_broken_links and find_duplicates.
 
         Args:
-            bookmark_data: The bookmark data structure
-            result: The list to append bookmarks to
-            current_path: The current folder path
+            bookmarks: The bookmark data structure
+
+        Yields:
+            (bookmark, folder path) pairs in document order
         """
-        if current_path is None:
-            current_path = []
-
-        if bookmark_data['type'] == 'folder':
-            folder_path = current_path + [bookmark_data['title']]
-
-            for child in bookmark_data.get('children', []):
-                if child['type'] == 'bookmark':
-                    # Add folder path information to bookmark
-                    child_copy = child.copy()
-                    child_copy['folderPath'] = folder_path
-                    result.append(child_copy)
-                else:  # It's a folder
-                    self._extract_all_bookmarks(child, result, folder_path)
-
-    def _is_valid_url(self, url: str) -> bool:
+        if bookmarks['type'] != 'folder':
+            return
+
+        stack = deque([(bookmarks, ())])
+
+        while stack:
+            node, path = stack.pop()
+
+            if node['type'] == 'folder':
+                folder_path = path + (node['title'],)
+
+                # Push in reverse so children come off the stack in document order
+                for child in reversed(node.get('children', [])):
+                    stack.append((child, folder_path))
+            else:  # It's a bookmark
+                yield node, path
+
+    def _is_web_url(self, parsed: ParseResult) -> bool:
         """
-        Check if a URL is valid for HTTP/HTTPS requests.
+        Check if a parsed URL points to an HTTP/HTTPS host.
 
         Args:
-            url: URL string
+            parsed: Result of urlparse
 
         Returns:
             True if valid, False otherwise
         """
-        if not url:
-            return False
-
-        # Skip non-web URLs
-        if url.startswith(('javascript:', 'file:', 'chrome:', 'edge:', 'about:')):
+        if parsed.scheme not in ('http', 'https'):
             return False
 
-        # Basic URL pattern matching
-        pattern = re.compile(
-            r'^(?:http|https)://'  # http:// or https://
-            # domain
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'
-            r'localhost|'  # localhost
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # or ipv4
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+))', re.IGNORECASE)
-
-        return bool(pattern.match(url))
\ No newline at end of file
+        # Require a dotted host name (or IPv4 address) unless it's localhost
+        host = parsed.hostname or ''
+        return '.' in host or host == 'localhost'
@@ -0,0 +1,64 @@
+"""Tests for the bookmark parser."""
+from bookmark_organizer.parser import BookmarkParser
+
+CHROME_HEADER = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<!-- This is an automatically generated file.
+     It will be read and overwritten.
+     DO NOT EDIT! -->
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+"""
+
+
+def parse(body: str):
+    return BookmarkParser().parse_html(CHROME_HEADER + body)
+
+
+def test_raw_ampersands_in_urls_are_kept():
+    bookmarks = parse("""<DL><p>
+    <DT><A HREF="https://example.com/?q=1&region=us&section=2&notify=no">Raw</A>
+    <DT><A HREF="https://example.com/?a=1&amp;copy=2&reg=3">Escaped</A>
+    <DT><A HREF="https://example.com/&reg;&reg x">Entities</A>
+</DL><p>
+""")
+
+    assert [child["url"] for child in bookmarks["children"]] == [
+        "https://example.com/?q=1&region=us&section=2&notify=no",
+        "https://example.com/?a=1&copy=2&reg=3",
+        "https://example.com/®® x",
+    ]
+
+
+def test_folder_takes_precedence_over_bookmark_in_same_dt():
+    bookmarks = parse("""<DL><p>
+    <DT><A HREF="https://example.com/before">Before</A><H3>Folder</H3>
+    <DL><p>
+        <DT><A HREF="https://example.com/inside">Inside</A>
+    </DL><p>
+    <DT><A HREF="https://example.com/after">After</A>
+</DL><p>
+""")
+
+    folder, after = bookmarks["children"]
+    assert folder["title"] == "Folder"
+    assert [child["url"] for child in folder["children"]] == ["https://example.com/inside"]
+    assert after["url"] == "https://example.com/after"
+
+
+def test_line_breaks_are_normalized_and_nul_is_dropped():
+    bookmarks = parse(
+        '<DL><p>\r\n'
+        '    <DT><H3>Fol\x00der\r\nname</H3>\r\n'
+        '    <DL><p>\r\n'
+        '        <DT><A HREF="https://example.com/a\x00b">x\r\ny\rz</A>\r\n'
+        '    </DL><p>\r\n'
+        '</DL><p>\r\n'
+    )
+
+    folder = bookmarks["children"][0]
+    assert folder["title"] == "Folder\nname"
+
+    bookmark = folder["children"][0]
+    assert bookmark["title"] == "x\ny\nz"
+    assert bookmark["url"] == "https://example.com/ab"
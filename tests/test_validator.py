@@ -0,0 +1,254 @@
+"""Tests for the bookmark validator's link checking."""
+import asyncio
+import socket
+import sqlite3
+import threading
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bookmark_organizer.validator import BookmarkValidator
+
+
+@pytest.fixture
+def serve():
+    """
+    Start aiohttp applications on a local test server.
+
+    The server runs its own event loop in a background thread, since the
+    validator runs one of its own with asyncio.run().
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = []
+
+    def start(app: web.Application) -> TestServer:
+        server = TestServer(app)
+        asyncio.run_coroutine_threadsafe(server.start_server(), loop).result()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def make_app(*routes: web.RouteDef) -> web.Application:
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+def check(validator: BookmarkValidator, *urls: str) -> dict:
+    """Check the given URLs and return the status of the broken ones by URL."""
+    bookmarks = {
+        "type": "folder",
+        "title": "Bookmarks",
+        "children": [{"type": "bookmark", "title": url, "url": url} for url in urls],
+    }
+    broken = validator.find_broken_links(bookmarks, show_progress=False)
+    return {link["url"]: link["status"] for link in broken}
+
+
+def test_redirect_to_failing_target_is_broken(serve):
+    async def redirect(request):
+        raise web.HTTPMovedPermanently(request.path + "/")
+
+    async def error(request):
+        return web.Response(status=500)
+
+    async def missing(request):
+        raise web.HTTPFound("/gone")
+
+    server = serve(make_app(
+        web.route("*", "/selfredir", redirect),
+        web.route("*", "/selfredir/", error),
+        web.route("*", "/moved", missing),
+    ))
+
+    with BookmarkValidator(max_retries=0) as validator:
+        result = check(validator,
+                       str(server.make_url("/selfredir")),
+                       str(server.make_url("/moved")))
+
+    assert result == {
+        str(server.make_url("/selfredir")): "HTTP 500",
+        str(server.make_url("/moved")): "HTTP 404",
+    }
+
+
+def test_head_405_falls_back_to_get_and_remembers_host(serve):
+    requests = []
+
+    async def handler(request):
+        requests.append((request.method, request.path))
+        if request.method == "HEAD" and request.path == "/no-head":
+            return web.Response(status=405)
+        return web.Response(text="ok")
+
+    server = serve(make_app(web.route("*", "/{name}", handler)))
+
+    with BookmarkValidator() as validator:
+        assert check(validator, str(server.make_url("/no-head"))) == {}
+        assert "127.0.0.1" in validator._get_only_hosts
+
+        # Later links on the same host skip the HEAD request
+        assert check(validator, str(server.make_url("/other"))) == {}
+
+    assert requests == [("HEAD", "/no-head"), ("GET", "/no-head"), ("GET", "/other")]
+
+
+def test_head_403_and_404_are_final(serve):
+    requests = []
+
+    async def handler(request):
+        requests.append((request.method, request.path))
+        return web.Response(status=int(request.match_info["status"]))
+
+    server = serve(make_app(web.route("*", "/{status}", handler)))
+
+    with BookmarkValidator() as validator:
+        result = check(validator, str(server.make_url("/403")), str(server.make_url("/404")))
+
+    assert result == {
+        str(server.make_url("/403")): "HTTP 403",
+        str(server.make_url("/404")): "HTTP 404",
+    }
+    assert sorted(requests) == [("HEAD", "/403"), ("HEAD", "/404")]
+
+
+def test_redirects_are_capped_at_five_hops(serve):
+    async def chain(request):
+        hops = int(request.match_info["hops"])
+        if hops == 0:
+            return web.Response(text="ok")
+        raise web.HTTPFound(f"/chain/{hops - 1}")
+
+    server = serve(make_app(web.route("*", "/chain/{hops}", chain)))
+
+    with BookmarkValidator() as validator:
+        result = check(validator,
+                       str(server.make_url("/chain/5")),
+                       str(server.make_url("/chain/6")))
+
+    assert result == {str(server.make_url("/chain/6")): "Too Many Redirects"}
+
+
+def test_transient_503_is_retried(serve):
+    attempts = []
+
+    async def flaky(request):
+        attempts.append(request.method)
+        if len(attempts) == 1:
+            return web.Response(status=503)
+        return web.Response(text="ok")
+
+    server = serve(make_app(web.route("*", "/flaky", flaky)))
+
+    with BookmarkValidator(max_retries=2) as validator:
+        assert check(validator, str(server.make_url("/flaky"))) == {}
+
+    assert attempts == ["HEAD", "HEAD"]
+
+
+def test_slow_response_times_out(serve):
+    async def slow(request):
+        await asyncio.sleep(5)
+        return web.Response(text="ok")
+
+    server = serve(make_app(web.route("*", "/slow", slow)))
+
+    with BookmarkValidator(timeout=0.2) as validator:
+        result = check(validator, str(server.make_url("/slow")))
+
+    assert result == {str(server.make_url("/slow")): "Timeout"}
+
+
+def test_refused_connection_is_broken():
+    # Reserve a free port, then close it so nothing is listening there
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/"
+
+    with BookmarkValidator(max_retries=0) as validator:
+        assert check(validator, url) == {url: "Connection Error"}
+
+
+def cached_statuses(cache_path) -> dict:
+    connection = sqlite3.connect(str(cache_path))
+    try:
+        return dict(connection.execute("SELECT url, status FROM link_status"))
+    finally:
+        connection.close()
+
+
+def test_cache_reuses_only_working_links(serve, tmp_path):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.path)
+        return web.Response(status=404 if request.path == "/bad" else 200)
+
+    server = serve(make_app(web.route("*", "/{name}", handler)))
+    good = str(server.make_url("/good"))
+    bad = str(server.make_url("/bad"))
+    cache_path = tmp_path / "status.db"
+
+    for _ in range(2):
+        with BookmarkValidator(cache_path=str(cache_path)) as validator:
+            assert check(validator, good, bad) == {bad: "HTTP 404"}
+
+    # The working link comes from the cache the second time; the failure is
+    # checked again
+    assert sorted(requests) == ["/bad", "/bad", "/good"]
+    assert cached_statuses(cache_path) == {good: 200, bad: 404}
+
+
+def test_expired_entry_is_revalidated_conditionally(serve, tmp_path):
+    requests = []
+
+    async def handler(request):
+        requests.append((request.headers.get("If-None-Match"),
+                         request.headers.get("If-Modified-Since")))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(headers={"ETag": '"v1"',
+                                     "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    server = serve(make_app(web.route("*", "/page", handler)))
+    url = str(server.make_url("/page"))
+    cache_path = tmp_path / "status.db"
+
+    # With a zero TTL every cached entry has already expired
+    for _ in range(2):
+        with BookmarkValidator(cache_path=str(cache_path), cache_ttl=0) as validator:
+            assert check(validator, url) == {}
+
+    assert requests == [(None, None), ('"v1"', "Mon, 01 Jan 2024 00:00:00 GMT")]
+
+    # The 304 stands for the status cached before
+    assert cached_statuses(cache_path) == {url: 200}
+
+
+def test_queued_statuses_are_written_on_close(tmp_path):
+    cache_path = tmp_path / "status.db"
+
+    with BookmarkValidator(cache_path=str(cache_path)) as validator:
+        validator._cache_store("https://example.com/", 200, None, None)
+        assert cached_statuses(cache_path) == {}
+
+    assert cached_statuses(cache_path) == {"https://example.com/": 200}
+
+    validator = BookmarkValidator(cache_path=str(cache_path))
+    validator._cache_store("https://example.org/", 301, None, None)
+    validator.close()
+
+    assert cached_statuses(cache_path) == {"https://example.com/": 200,
+                                           "https://example.org/": 301}